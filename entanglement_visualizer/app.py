@@ -7,12 +7,8 @@ It provides a user interface for creating, visualizing, and exploring quantum en
 
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
 from quantum_generator import EntanglementGenerator
 import visualizer
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
-import os
 
 # Set page configuration
 st.set_page_config(
@@ -25,6 +21,381 @@ st.set_page_config(
 # Apply custom styling
 visualizer.set_page_style()
 
+# Bell state choices as (label, bell_type) pairs
+_BELL_OPTIONS = (
+    ("Phi+ (|00⟩ + |11⟩)/√2", "phi_plus"),
+    ("Phi- (|00⟩ - |11⟩)/√2", "phi_minus"),
+    ("Psi+ (|01⟩ + |10⟩)/√2", "psi_plus"),
+    ("Psi- (|01⟩ - |10⟩)/√2", "psi_minus"),
+)
+
+
+# Cached state preparation. Streamlit reruns the whole script on every widget
+# interaction, so the simulator is only invoked the first time a state is requested.
+@st.cache_data(show_spinner=False)
+def _bell_state(bell_type: str):
+    """Prepare a Bell state and return its circuit and statevector."""
+    generator = EntanglementGenerator()
+    circuit = generator.create_bell_state(bell_type)
+    return circuit, generator.statevector
+
+@st.cache_data(show_spinner=False)
+def _ghz_state(num_qubits: int):
+    """Prepare a GHZ state and return its circuit and statevector."""
+    generator = EntanglementGenerator()
+    circuit = generator.create_ghz_state(num_qubits)
+    return circuit, generator.statevector
+
+@st.cache_data(show_spinner=False)
+def _w_state(num_qubits: int):
+    """Prepare a W state and return its circuit and statevector."""
+    generator = EntanglementGenerator()
+    circuit = generator.create_w_state(num_qubits)
+    return circuit, generator.statevector
+
+
+# Cached derived quantities, keyed on the state that produced them
+# (e.g. ("bell", "phi_plus") or ("ghz", 4)). The generator argument is not hashed.
+@st.cache_data(show_spinner=False)
+def _state_representation(state_key: tuple, _generator: EntanglementGenerator) -> str:
+    return _generator.get_state_vector_representation()
+
+@st.cache_data(show_spinner=False)
+def _density_matrix(state_key: tuple, _generator: EntanglementGenerator) -> np.ndarray:
+    return _generator.get_density_matrix()
+
+@st.cache_data(show_spinner=False)
+def _reduced_density_matrix(state_key: tuple, keep_indices: tuple, _generator: EntanglementGenerator) -> np.ndarray:
+    return _generator.get_reduced_density_matrix(list(keep_indices))
+
+@st.cache_data(show_spinner=False)
+def _concurrence(state_key: tuple, _generator: EntanglementGenerator) -> float:
+    return _generator.get_concurrence()
+
+@st.cache_data(show_spinner=False)
+def _correlation_matrix(state_key: tuple, _generator: EntanglementGenerator) -> np.ndarray:
+    return _generator.get_correlation_matrix()
+
+@st.cache_data(show_spinner=False)
+def _bell_value(state_key: tuple, _generator: EntanglementGenerator) -> float:
+    return _generator.get_bell_inequality_value()
+
+
+# Cached figures. Rendering (matplotlib circuit drawing in particular) is far more
+# expensive than the numbers behind it, so each figure is built once per state.
+@st.cache_resource(show_spinner=False)
+def _circuit_figure(state_key: tuple, _generator: EntanglementGenerator):
+    return _generator.get_circuit_drawing(output="mpl")
+
+@st.cache_data(show_spinner=False)
+def _circuit_text(state_key: tuple, _generator: EntanglementGenerator) -> str:
+    return str(_generator.get_circuit_drawing(output="text"))
+
+@st.cache_resource(show_spinner=False)
+def _dual_bloch_figure(state_key: tuple, _generator: EntanglementGenerator):
+    rho_0 = _reduced_density_matrix(state_key, (0,), _generator)
+    rho_1 = _reduced_density_matrix(state_key, (1,), _generator)
+    
+    # Calculate both Bloch vectors at once from the stacked reduced
+    # density matrices (Hermitian, so x = 2 Re rho01 and y = 2 Im rho10).
+    # Single precision is plenty for values that are only rendered.
+    rhos = np.stack([rho_0, rho_1]).astype(np.complex64, copy=False)
+    bloch = np.stack([
+        2 * rhos[:, 0, 1].real,                  # x
+        2 * rhos[:, 1, 0].imag,                  # y
+        (rhos[:, 0, 0] - rhos[:, 1, 1]).real     # z
+    ], axis=1)
+    bloch_0, bloch_1 = bloch
+    
+    return visualizer.plot_dual_bloch_spheres(bloch_0, bloch_1)
+
+@st.cache_resource(show_spinner=False)
+def _density_matrix_figure(state_key: tuple, _generator: EntanglementGenerator):
+    density_matrix = _density_matrix(state_key, _generator).astype(np.complex64, copy=False)
+    return visualizer.plot_density_matrix(density_matrix)
+
+
+@st.cache_resource(show_spinner=False)
+def _build_figure(plot_name: str, *args):
+    return getattr(visualizer, plot_name)(*args)
+
+def _cached_figure(plot_name: str, *args):
+    """Build a visualizer figure once per distinct set of inputs."""
+    # Round float inputs (Bloch coordinates, CHSH values) so that values differing
+    # only by floating-point noise share one cache entry. The figures are only
+    # read by st.plotly_chart, so sharing them between reruns is safe.
+    args = tuple(round(float(arg), 6) if isinstance(arg, (float, np.floating)) else arg
+                 for arg in args)
+    return _build_figure(plot_name, *args)
+
+
+# Cached measurements, keyed on the state and the measurement basis, so repeating
+# a measurement that was already run does not go back to the simulator.
+@st.cache_data(show_spinner=False)
+def _measure_in_basis(state_key: tuple, basis: str, _generator: EntanglementGenerator) -> dict:
+    return _generator.measure_in_basis(basis=basis)
+
+@st.cache_data(show_spinner=False)
+def _measure_in_custom_basis(state_key: tuple, theta: float, phi: float, _generator: EntanglementGenerator) -> dict:
+    return _generator.measure_in_custom_basis(theta=theta, phi=phi)
+
+
+def _load_state(state_key: tuple, prepared_state):
+    """Load a prepared (circuit, statevector) pair and reset derived results."""
+    st.session_state.entanglement_generator.load_state(*prepared_state)
+    st.session_state.state_key = state_key
+    # Reset measurements
+    st.session_state.measured_results = None
+    st.session_state.correlation_matrix = None
+    st.session_state.bell_value = None
+
+
+# Sidebar actions. Each handler updates st.session_state and returns a
+# (level, message) pair that is shown in the sidebar after the rerun.
+def _generate_bell_state() -> tuple:
+    bell_type = st.session_state.bell_type
+    _load_state(("bell", bell_type), _bell_state(bell_type))
+    label = next(label for label, value in _BELL_OPTIONS if value == bell_type)
+    return "success", f"Generated Bell state: {label}"
+
+def _generate_ghz_state() -> tuple:
+    num_qubits = st.session_state.ghz_qubits
+    _load_state(("ghz", num_qubits), _ghz_state(num_qubits))
+    return "success", f"Generated GHZ state with {num_qubits} qubits"
+
+def _generate_w_state() -> tuple:
+    num_qubits = st.session_state.w_qubits
+    _load_state(("w", num_qubits), _w_state(num_qubits))
+    return "success", f"Generated W state with {num_qubits} qubits"
+
+def _perform_measurement() -> tuple:
+    if st.session_state.entanglement_generator.circuit is None:
+        return "error", "Please generate a quantum state first"
+    
+    # Nothing changed since the last measurement: keep the results on screen
+    standard = st.session_state.measurement_type == "Standard Basis (X, Y, Z)"
+    if standard:
+        measure_key = (st.session_state.state_key, st.session_state.measurement_basis)
+    else:
+        measure_key = (st.session_state.state_key,
+                       round(st.session_state.custom_theta, 4), round(st.session_state.custom_phi, 4))
+    if st.session_state.measured_results is not None and measure_key == st.session_state.last_measure_key:
+        return "info", "Reusing previous measurement"
+    st.session_state.last_measure_key = measure_key
+    
+    if standard:
+        st.session_state.measured_results = _measure_in_basis(
+            st.session_state.state_key,
+            st.session_state.measurement_basis,
+            st.session_state.entanglement_generator
+        )
+    else:
+        st.session_state.measured_results = _measure_in_custom_basis(
+            st.session_state.state_key,
+            st.session_state.custom_theta,
+            st.session_state.custom_phi,
+            st.session_state.entanglement_generator
+        )
+    return "success", "Measurement completed"
+
+def _calculate_correlation_matrix() -> tuple:
+    if st.session_state.entanglement_generator.statevector is None:
+        return "error", "Please generate a quantum state first"
+    
+    st.session_state.correlation_matrix = _correlation_matrix(
+        st.session_state.state_key, st.session_state.entanglement_generator
+    )
+    return "success", "Correlation matrix calculated"
+
+def _calculate_bell_value() -> tuple:
+    if st.session_state.entanglement_generator.statevector is None:
+        return "error", "Please generate a quantum state first"
+    
+    st.session_state.bell_value = _bell_value(
+        st.session_state.state_key, st.session_state.entanglement_generator
+    )
+    return "success", f"Bell inequality value: {st.session_state.bell_value:.4f}"
+
+# Action name -> (handler, error message prefix)
+_ACTIONS = {
+    "generate_bell": (_generate_bell_state, "Error generating Bell state"),
+    "generate_ghz": (_generate_ghz_state, "Error generating GHZ state"),
+    "generate_w": (_generate_w_state, "Error generating W state"),
+    "measure": (_perform_measurement, "Error performing measurement"),
+    "correlation_matrix": (_calculate_correlation_matrix, "Error calculating correlation matrix"),
+    "bell_value": (_calculate_bell_value, "Error calculating Bell inequality value"),
+}
+
+def _run_action(action: str):
+    """Button callback: dispatch to the action handler and record its outcome."""
+    handler, error_prefix = _ACTIONS[action]
+    try:
+        st.session_state.action_message = handler()
+    except Exception as e:
+        st.session_state.action_message = ("error", f"{error_prefix}: {e}")
+
+
+# Each tab is a fragment, so interacting with widgets inside one tab reruns
+# only that tab instead of the whole script.
+@st.fragment
+def _render_state_tab():
+    """Render the quantum state tab (circuit, state vector, Bloch spheres)."""
+    st.header("Quantum State Visualization")
+    
+    if st.session_state.entanglement_generator.circuit is not None:
+        # Display circuit
+        try:
+            circuit_drawing = _circuit_figure(st.session_state.state_key, st.session_state.entanglement_generator)
+            st.subheader("Quantum Circuit")
+            st.pyplot(circuit_drawing)
+        except Exception as e:
+            st.error(f"Error displaying circuit: {e}")
+            # Fallback to text representation
+            try:
+                circuit_text = _circuit_text(st.session_state.state_key, st.session_state.entanglement_generator)
+                st.text(circuit_text)
+            except:
+                st.error("Could not display circuit in any format.")
+        
+        # Display state vector representation
+        try:
+            state_str = _state_representation(st.session_state.state_key, st.session_state.entanglement_generator)
+            visualizer.display_quantum_state(state_str)
+        except Exception as e:
+            st.error(f"Error displaying state vector: {e}")
+        
+        # Display Bloch sphere representation for small number of qubits
+        try:
+            if st.session_state.entanglement_generator.statevector is not None:
+                num_qubits = st.session_state.entanglement_generator.num_qubits
+                
+                if num_qubits == 1:
+                    # Single qubit state
+                    bloch_vector = st.session_state.entanglement_generator.get_bloch_vector(0)
+                    fig = _cached_figure("plot_bloch_sphere", *bloch_vector)
+                    st.plotly_chart(fig, theme=None)
+                elif num_qubits == 2:
+                    # Two-qubit state, show reduced density matrices
+                    try:
+                        # Plot dual Bloch spheres from the reduced density matrices
+                        fig = _dual_bloch_figure(st.session_state.state_key, st.session_state.entanglement_generator)
+                        st.plotly_chart(fig, theme=None)
+                        
+                        # Display concurrence (measure of entanglement)
+                        try:
+                            concurrence = _concurrence(st.session_state.state_key, st.session_state.entanglement_generator)
+                            st.metric("Concurrence (Entanglement Measure)", f"{concurrence:.4f}")
+                            st.info("Concurrence ranges from 0 (separable state) to 1 (maximally entangled state).")
+                        except Exception as e:
+                            st.error(f"Error calculating concurrence: {e}")
+                        
+                    except Exception as e:
+                        st.error(f"Error displaying Bloch spheres: {e}")
+                else:
+                    st.info(f"Bloch sphere visualization not shown for {num_qubits} qubits (too many dimensions).")
+        except Exception as e:
+            st.error(f"Error with Bloch sphere visualization: {e}")
+    else:
+        st.info("Generate a quantum state to see its visualization.")
+
+
+@st.fragment
+def _render_measurement_tab():
+    """Render the measurement results tab."""
+    st.header("Measurement Results")
+    
+    if st.session_state.measured_results is not None:
+        # Display measurement results
+        try:
+            # Show the measurement basis used
+            if st.session_state.measurement_basis in ['X', 'Y', 'Z']:
+                st.subheader(f"Measurement in {st.session_state.measurement_basis} Basis")
+            else:
+                st.subheader(f"Measurement in Custom Basis (θ={st.session_state.custom_theta:.2f}, φ={st.session_state.custom_phi:.2f})")
+                # Show the measurement direction on Bloch sphere
+                fig = _cached_figure("plot_measurement_angles", st.session_state.custom_theta, st.session_state.custom_phi)
+                st.plotly_chart(fig, theme=None)
+            
+            # Plot measurement results
+            fig = _cached_figure("plot_measurement_results", st.session_state.measured_results, 1024)
+            st.plotly_chart(fig, theme=None)
+            
+            # For two-qubit states, show correlation visualization
+            try:
+                if st.session_state.entanglement_generator.num_qubits == 2:
+                    fig = _cached_figure("plot_measurement_correlations", st.session_state.measured_results, 1024)
+                    st.plotly_chart(fig, theme=None)
+            except Exception as e:
+                st.error(f"Error displaying correlation visualization: {e}")
+            
+        except Exception as e:
+            st.error(f"Error displaying measurement results: {e}")
+    else:
+        st.info("Perform a measurement to see the results.")
+
+
+@st.fragment
+def _render_analysis_tab():
+    """Render the entanglement analysis tab (correlations, Bell test, density matrix)."""
+    st.header("Entanglement Analysis")
+    
+    # Display correlation matrix if available
+    if st.session_state.correlation_matrix is not None:
+        try:
+            st.subheader("Correlation Matrix")
+            fig = _cached_figure("plot_correlation_matrix", st.session_state.correlation_matrix)
+            st.plotly_chart(fig, theme=None)
+            
+            st.markdown("""
+            The correlation matrix shows the expected values of Pauli operator products between qubits.
+            For example, the (X, Z) entry shows the correlation between measuring the first qubit in the X basis
+            and the second qubit in the Z basis.
+            """)
+        except Exception as e:
+            st.error(f"Error displaying correlation matrix: {e}")
+    
+    # Display Bell inequality value if available
+    if st.session_state.bell_value is not None:
+        try:
+            st.subheader("Bell Inequality Test")
+            fig = _cached_figure("plot_bell_inequality", st.session_state.bell_value)
+            st.plotly_chart(fig, theme=None)
+            
+            # Interpretation of the Bell value
+            if st.session_state.bell_value <= 2.0:
+                st.info("The state satisfies Bell's inequality and could be explained by classical physics.")
+            elif st.session_state.bell_value > 2.0 and st.session_state.bell_value < 2.7:
+                st.success("The state violates Bell's inequality, demonstrating quantum entanglement!")
+            else:
+                st.success("The state strongly violates Bell's inequality, showing significant quantum entanglement!")
+        except Exception as e:
+            st.error(f"Error displaying Bell inequality value: {e}")
+    
+    # Display density matrix if a state is available
+    if st.session_state.entanglement_generator.statevector is not None:
+        try:
+            st.subheader("Density Matrix")
+            fig = _density_matrix_figure(st.session_state.state_key, st.session_state.entanglement_generator)
+            st.plotly_chart(fig, theme=None)
+        except Exception as e:
+            st.error(f"Error displaying density matrix: {e}")
+    
+    if st.session_state.correlation_matrix is None and st.session_state.bell_value is None:
+        st.info("Calculate the correlation matrix or Bell inequality value to see the analysis.")
+
+
+@st.fragment
+def _render_learn_tab():
+    """Render the static Learn tab."""
+    st.header("Learn About Quantum Entanglement")
+    
+    # Display explanation of quantum entanglement
+    visualizer.display_entanglement_explanation()
+    
+    # Display explanation of Bell's inequality
+    visualizer.display_bell_inequality_explanation()
+
+
 def main():
     # Page header
     st.title("Quantum Entanglement Visualizer")
@@ -43,6 +414,9 @@ def main():
         st.session_state.measured_results = None
         st.session_state.correlation_matrix = None
         st.session_state.bell_value = None
+        st.session_state.state_key = None
+        st.session_state.action_message = None
+        st.session_state.last_measure_key = None
     
     # Sidebar for state generation and measurement
     with st.sidebar:
@@ -55,67 +429,27 @@ def main():
         )
         
         if state_type == "Bell State":
-            # Bell state selection
-            bell_type = st.selectbox(
+            # Bell state selection, mapped to the bell_type parameter by index
+            bell_index = st.selectbox(
                 "Select Bell State",
-                [
-                    "Phi+ (|00⟩ + |11⟩)/√2",
-                    "Phi- (|00⟩ - |11⟩)/√2",
-                    "Psi+ (|01⟩ + |10⟩)/√2",
-                    "Psi- (|01⟩ - |10⟩)/√2"
-                ]
+                range(len(_BELL_OPTIONS)),
+                format_func=lambda i: _BELL_OPTIONS[i][0]
             )
+            st.session_state.bell_type = _BELL_OPTIONS[bell_index][1]
             
-            # Map selection to bell_type parameter
-            bell_type_map = {
-                "Phi+ (|00⟩ + |11⟩)/√2": "phi_plus",
-                "Phi- (|00⟩ - |11⟩)/√2": "phi_minus",
-                "Psi+ (|01⟩ + |10⟩)/√2": "psi_plus",
-                "Psi- (|01⟩ - |10⟩)/√2": "psi_minus"
-            }
-            
-            st.session_state.bell_type = bell_type_map[bell_type]
-            
-            # Button to generate Bell state
-            if st.button("Generate Bell State"):
-                with st.spinner("Generating Bell state..."):
-                    st.session_state.entanglement_generator.create_bell_state(st.session_state.bell_type)
-                    # Reset measurements
-                    st.session_state.measured_results = None
-                    st.session_state.correlation_matrix = None
-                    st.session_state.bell_value = None
-                st.success(f"Generated Bell state: {bell_type}")
+            st.button("Generate Bell State", on_click=_run_action, args=("generate_bell",))
         
         elif state_type == "GHZ State":
             # GHZ state configuration
-            num_qubits = st.slider("Number of Qubits", min_value=3, max_value=5, value=3)
+            st.slider("Number of Qubits", min_value=3, max_value=5, value=3, key="ghz_qubits")
             
-            # Button to generate GHZ state
-            if st.button("Generate GHZ State"):
-                with st.spinner("Generating GHZ state..."):
-                    st.session_state.entanglement_generator.create_ghz_state(num_qubits)
-                    # Reset measurements
-                    st.session_state.measured_results = None
-                    st.session_state.correlation_matrix = None
-                    st.session_state.bell_value = None
-                st.success(f"Generated GHZ state with {num_qubits} qubits")
+            st.button("Generate GHZ State", on_click=_run_action, args=("generate_ghz",))
         
         elif state_type == "W State":
-            # W state is currently only implemented for 3 qubits
-            st.info("W state is currently only implemented for 3 qubits")
+            # W state configuration
+            st.slider("Number of Qubits", min_value=3, max_value=5, value=3, key="w_qubits")
             
-            # Button to generate W state
-            if st.button("Generate W State"):
-                with st.spinner("Generating W state..."):
-                    try:
-                        st.session_state.entanglement_generator.create_w_state()
-                        # Reset measurements
-                        st.session_state.measured_results = None
-                        st.session_state.correlation_matrix = None
-                        st.session_state.bell_value = None
-                        st.success("Generated W state with 3 qubits")
-                    except Exception as e:
-                        st.error(f"Error generating W state: {e}")
+            st.button("Generate W State", on_click=_run_action, args=("generate_w",))
         
         # Measurement section
         st.header("Measurement")
@@ -123,7 +457,8 @@ def main():
         # Measurement basis selection
         measurement_type = st.radio(
             "Measurement Type",
-            ["Standard Basis (X, Y, Z)", "Custom Basis (θ, φ)"]
+            ["Standard Basis (X, Y, Z)", "Custom Basis (θ, φ)"],
+            key="measurement_type"
         )
         
         if measurement_type == "Standard Basis (X, Y, Z)":
@@ -149,217 +484,31 @@ def main():
                 format="%.2f"
             )
         
-        # Button to perform measurement
-        if st.button("Perform Measurement"):
-            if st.session_state.entanglement_generator.circuit is None:
-                st.error("Please generate a quantum state first")
-            else:
-                with st.spinner("Performing measurement..."):
-                    try:
-                        if measurement_type == "Standard Basis (X, Y, Z)":
-                            st.session_state.measured_results = st.session_state.entanglement_generator.measure_in_basis(
-                                basis=st.session_state.measurement_basis
-                            )
-                        else:
-                            st.session_state.measured_results = st.session_state.entanglement_generator.measure_in_custom_basis(
-                                theta=st.session_state.custom_theta,
-                                phi=st.session_state.custom_phi
-                            )
-                        st.success("Measurement completed")
-                    except Exception as e:
-                        st.error(f"Error performing measurement: {e}")
-        
-        # Button to calculate correlation matrix (for Bell states)
-        if st.button("Calculate Correlation Matrix"):
-            if st.session_state.entanglement_generator.statevector is None:
-                st.error("Please generate a quantum state first")
-            else:
-                with st.spinner("Calculating correlation matrix..."):
-                    try:
-                        st.session_state.correlation_matrix = st.session_state.entanglement_generator.get_correlation_matrix()
-                        st.success("Correlation matrix calculated")
-                    except Exception as e:
-                        st.error(f"Error calculating correlation matrix: {e}")
+        # Action buttons run their handler as a callback before the rerun
+        st.button("Perform Measurement", on_click=_run_action, args=("measure",))
+        st.button("Calculate Correlation Matrix", on_click=_run_action, args=("correlation_matrix",))
+        st.button("Calculate Bell Inequality Value", on_click=_run_action, args=("bell_value",))
         
-        # Button to calculate Bell inequality value (for Bell states)
-        if st.button("Calculate Bell Inequality Value"):
-            if st.session_state.entanglement_generator.statevector is None:
-                st.error("Please generate a quantum state first")
-            else:
-                with st.spinner("Calculating Bell inequality value..."):
-                    try:
-                        st.session_state.bell_value = st.session_state.entanglement_generator.get_bell_inequality_value()
-                        st.success(f"Bell inequality value: {st.session_state.bell_value:.4f}")
-                    except Exception as e:
-                        st.error(f"Error calculating Bell inequality value: {e}")
+        # Report the outcome of the last action
+        if st.session_state.action_message is not None:
+            level, message = st.session_state.action_message
+            getattr(st, level)(message)
+            st.session_state.action_message = None
     
     # Main area with tabs for different visualizations
     tab1, tab2, tab3, tab4 = st.tabs(["Quantum State", "Measurement Results", "Entanglement Analysis", "Learn"])
     
     with tab1:
-        st.header("Quantum State Visualization")
-        
-        if st.session_state.entanglement_generator.circuit is not None:
-            # Display circuit
-            try:
-                circuit_drawing = st.session_state.entanglement_generator.get_circuit_drawing(output="mpl")
-                st.subheader("Quantum Circuit")
-                st.pyplot(circuit_drawing)
-            except Exception as e:
-                st.error(f"Error displaying circuit: {e}")
-                # Fallback to text representation
-                try:
-                    circuit_text = st.session_state.entanglement_generator.get_circuit_drawing(output="text")
-                    st.text(circuit_text)
-                except:
-                    st.error("Could not display circuit in any format.")
-            
-            # Display state vector representation
-            try:
-                state_str = st.session_state.entanglement_generator.get_state_vector_representation()
-                visualizer.display_quantum_state(state_str)
-            except Exception as e:
-                st.error(f"Error displaying state vector: {e}")
-            
-            # Display Bloch sphere representation for small number of qubits
-            try:
-                if st.session_state.entanglement_generator.statevector is not None:
-                    num_qubits = int(np.log2(len(st.session_state.entanglement_generator.statevector)))
-                    
-                    if num_qubits == 1:
-                        # Single qubit state
-                        bloch_vector = st.session_state.entanglement_generator.get_bloch_vector(0)
-                        fig = visualizer.plot_bloch_sphere(*bloch_vector)
-                        st.plotly_chart(fig)
-                    elif num_qubits == 2:
-                        # Two-qubit state, show reduced density matrices
-                        try:
-                            # Get reduced density matrices
-                            rho_0 = st.session_state.entanglement_generator.get_reduced_density_matrix([0])
-                            rho_1 = st.session_state.entanglement_generator.get_reduced_density_matrix([1])
-                            
-                            # Calculate Bloch vectors from reduced density matrices
-                            bloch_0 = (
-                                np.real(rho_0[0, 1] + rho_0[1, 0]),  # x
-                                np.imag(rho_0[1, 0] - rho_0[0, 1]),  # y
-                                np.real(rho_0[0, 0] - rho_0[1, 1])   # z
-                            )
-                            
-                            bloch_1 = (
-                                np.real(rho_1[0, 1] + rho_1[1, 0]),  # x
-                                np.imag(rho_1[1, 0] - rho_1[0, 1]),  # y
-                                np.real(rho_1[0, 0] - rho_1[1, 1])   # z
-                            )
-                            
-                            # Plot dual Bloch spheres
-                            fig = visualizer.plot_dual_bloch_spheres(bloch_0, bloch_1)
-                            st.plotly_chart(fig)
-                            
-                            # Display concurrence (measure of entanglement)
-                            try:
-                                concurrence = st.session_state.entanglement_generator.get_concurrence()
-                                st.metric("Concurrence (Entanglement Measure)", f"{concurrence:.4f}")
-                                st.info("Concurrence ranges from 0 (separable state) to 1 (maximally entangled state).")
-                            except Exception as e:
-                                st.error(f"Error calculating concurrence: {e}")
-                            
-                        except Exception as e:
-                            st.error(f"Error displaying Bloch spheres: {e}")
-                    else:
-                        st.info(f"Bloch sphere visualization not shown for {num_qubits} qubits (too many dimensions).")
-            except Exception as e:
-                st.error(f"Error with Bloch sphere visualization: {e}")
-        else:
-            st.info("Generate a quantum state to see its visualization.")
+        _render_state_tab()
     
     with tab2:
-        st.header("Measurement Results")
-        
-        if st.session_state.measured_results is not None:
-            # Display measurement results
-            try:
-                # Show the measurement basis used
-                if st.session_state.measurement_basis in ['X', 'Y', 'Z']:
-                    st.subheader(f"Measurement in {st.session_state.measurement_basis} Basis")
-                else:
-                    st.subheader(f"Measurement in Custom Basis (θ={st.session_state.custom_theta:.2f}, φ={st.session_state.custom_phi:.2f})")
-                    # Show the measurement direction on Bloch sphere
-                    fig = visualizer.plot_measurement_angles(st.session_state.custom_theta, st.session_state.custom_phi)
-                    st.plotly_chart(fig)
-                
-                # Plot measurement results
-                fig = visualizer.plot_measurement_results(st.session_state.measured_results, shots=1024)
-                st.plotly_chart(fig)
-                
-                # For two-qubit states, show correlation visualization
-                try:
-                    if all(len(state) == 2 for state in st.session_state.measured_results.keys()):
-                        fig = visualizer.plot_measurement_correlations(st.session_state.measured_results, shots=1024)
-                        st.plotly_chart(fig)
-                except Exception as e:
-                    st.error(f"Error displaying correlation visualization: {e}")
-                
-            except Exception as e:
-                st.error(f"Error displaying measurement results: {e}")
-        else:
-            st.info("Perform a measurement to see the results.")
+        _render_measurement_tab()
     
     with tab3:
-        st.header("Entanglement Analysis")
-        
-        # Display correlation matrix if available
-        if st.session_state.correlation_matrix is not None:
-            try:
-                st.subheader("Correlation Matrix")
-                fig = visualizer.plot_correlation_matrix(st.session_state.correlation_matrix)
-                st.plotly_chart(fig)
-                
-                st.markdown("""
-                The correlation matrix shows the expected values of Pauli operator products between qubits.
-                For example, the (X, Z) entry shows the correlation between measuring the first qubit in the X basis
-                and the second qubit in the Z basis.
-                """)
-            except Exception as e:
-                st.error(f"Error displaying correlation matrix: {e}")
-        
-        # Display Bell inequality value if available
-        if st.session_state.bell_value is not None:
-            try:
-                st.subheader("Bell Inequality Test")
-                fig = visualizer.plot_bell_inequality(st.session_state.bell_value)
-                st.plotly_chart(fig)
-                
-                # Interpretation of the Bell value
-                if st.session_state.bell_value <= 2.0:
-                    st.info("The state satisfies Bell's inequality and could be explained by classical physics.")
-                elif st.session_state.bell_value > 2.0 and st.session_state.bell_value < 2.7:
-                    st.success("The state violates Bell's inequality, demonstrating quantum entanglement!")
-                else:
-                    st.success("The state strongly violates Bell's inequality, showing significant quantum entanglement!")
-            except Exception as e:
-                st.error(f"Error displaying Bell inequality value: {e}")
-        
-        # Display density matrix if a state is available
-        if st.session_state.entanglement_generator.statevector is not None:
-            try:
-                st.subheader("Density Matrix")
-                density_matrix = st.session_state.entanglement_generator.get_density_matrix()
-                fig = visualizer.plot_density_matrix(density_matrix)
-                st.plotly_chart(fig)
-            except Exception as e:
-                st.error(f"Error displaying density matrix: {e}")
-        
-        if st.session_state.correlation_matrix is None and st.session_state.bell_value is None:
-            st.info("Calculate the correlation matrix or Bell inequality value to see the analysis.")
+        _render_analysis_tab()
     
     with tab4:
-        st.header("Learn About Quantum Entanglement")
-        
-        # Display explanation of quantum entanglement
-        visualizer.display_entanglement_explanation()
-        
-        # Display explanation of Bell's inequality
-        visualizer.display_bell_inequality_explanation()
+        _render_learn_tab()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
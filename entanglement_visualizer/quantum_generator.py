@@ -5,24 +5,201 @@ This module provides functionality for creating various entangled states (Bell s
 measuring them in different bases, and analyzing the resulting correlations.
 """
 
+import os
 from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
 from qiskit_aer.backends.aer_simulator import AerSimulator
-from qiskit.visualization import plot_histogram, plot_bloch_multivector
-from qiskit.quantum_info import Statevector, partial_trace, state_fidelity
+from qiskit.quantum_info import SparsePauliOp, Statevector, state_fidelity
 import numpy as np
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional, Union, Any
 
+# Single-qubit Pauli matrices
+_PAULI = {
+    'I': np.array([[1, 0], [0, 1]], dtype=complex),
+    'X': np.array([[0, 1], [1, 0]], dtype=complex),
+    'Y': np.array([[0, -1j], [1j, 0]], dtype=complex),
+    'Z': np.array([[1, 0], [0, -1]], dtype=complex),
+}
+
+
+@lru_cache(maxsize=None)
+def _pauli_action(pauli_string: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the action of a multi-qubit Pauli operator on computational basis states.
+    
+    A Pauli string maps |j⟩ to phase[j] · |j ⊕ x⟩, where x flags the X/Y positions,
+    so ⟨ψ|P|ψ⟩ can be evaluated in O(2^n) without building the 2^n × 2^n matrix.
+    
+    Args:
+        pauli_string: String representing the Pauli operator (e.g., 'XY', 'ZZ')
+        
+    Returns:
+        Tuple of (flipped indices j ⊕ x, phases), both read-only
+    """
+    num_qubits = len(pauli_string)
+    indices = np.arange(2 ** num_qubits)
+    x_mask = 0
+    phases = np.full(indices.shape, 1j ** pauli_string.count('Y'), dtype=complex)
+    # The leftmost character acts on the most significant qubit, as in np.kron
+    for position, char in enumerate(pauli_string):
+        bit = num_qubits - 1 - position
+        if char in 'XY':
+            x_mask |= 1 << bit
+        if char in 'YZ':
+            phases[(indices >> bit) & 1 == 1] *= -1
+    flipped = indices ^ x_mask
+    flipped.setflags(write=False)
+    phases.setflags(write=False)
+    return flipped, phases
+
+
+# The nine correlation terms P_i ⊗ P_j as one batched operator, densified once to
+# shape (3, 3, 4, 4) so that all of them come out of a single einsum over the statevector.
+# Stored in single precision: the entries are exact and the result is only plotted.
+_CORRELATION_BASES = 'XYZ'
+_CORRELATION_PAULI_OP = SparsePauliOp(
+    [b1 + b2 for b1 in _CORRELATION_BASES for b2 in _CORRELATION_BASES]
+)
+_PAULI_PAIRS = np.array(
+    [term.to_matrix() for term in _CORRELATION_PAULI_OP], dtype=np.complex64
+).reshape(3, 3, 4, 4)
+
+# σ_y ⊗ σ_y, used to build the spin-flipped state for the concurrence
+_SIGMA_YY = np.kron(_PAULI['Y'], _PAULI['Y'])
+
+# Gate fusion only pays for its analysis pass on circuits of at least this many qubits
+_FUSION_MIN_QUBITS = 5
+
+# Basis-change unitaries applied before a computational-basis measurement
+_H = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+_SDG = np.array([[1, 0], [0, -1j]], dtype=complex)
+_BASIS_CHANGE = {
+    'X': _H,
+    'Y': _H @ _SDG,
+}
+
+# Closed-form Bell states, in Qiskit's little-endian ordering (index = q1 q0)
+_BELL_STATES = {
+    'phi_plus': np.array([1, 0, 0, 1], dtype=complex) / np.sqrt(2),
+    'phi_minus': np.array([1, 0, 0, -1], dtype=complex) / np.sqrt(2),
+    'psi_plus': np.array([0, 1, 1, 0], dtype=complex) / np.sqrt(2),
+    'psi_minus': np.array([0, 1, -1, 0], dtype=complex) / np.sqrt(2),
+}
+
+# CHSH operator S = ZZ - ZX + XZ + XX, using the measurement settings that give
+# the maximal violation for Bell states. Densified once, so all four terms are
+# evaluated together as a single 4x4 Hermitian form.
+_CHSH_PAULI_OP = SparsePauliOp.from_list([('ZZ', 1), ('ZX', -1), ('XZ', 1), ('XX', 1)])
+_CHSH_OP = _CHSH_PAULI_OP.to_matrix()
+
+
+@lru_cache(maxsize=128)
+def _custom_basis_unitary(theta: float, phi: float) -> np.ndarray:
+    """
+    Get the rotation applied before measuring in a custom basis.
+    
+    Args:
+        theta: Polar angle (0 to π)
+        phi: Azimuthal angle (0 to 2π)
+        
+    Returns:
+        2x2 unitary H · RZ(φ) · RY(θ) (read-only, shared between calls)
+    """
+    # Closed form of H · RZ(φ) · RY(θ), with a = e^{-iφ/2} and b = e^{iφ/2}
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    a, b = np.exp(-0.5j * phi), np.exp(0.5j * phi)
+    unitary = np.array([
+        [a * c + b * s, b * c - a * s],
+        [a * c - b * s, -(a * s + b * c)]
+    ]) / np.sqrt(2)
+    unitary.setflags(write=False)
+    return unitary
+
+
+@lru_cache(maxsize=None)
+def _gpu_available() -> bool:
+    """Check once whether this Aer build can simulate on a GPU (cuStateVec/Thrust)."""
+    try:
+        return 'GPU' in AerSimulator().available_devices()
+    except Exception:
+        return False
+
+
+def _format_amplitude(amplitude: complex) -> str:
+    """
+    Format a complex amplitude for the state vector representation.
+    
+    Args:
+        amplitude: Complex amplitude
+        
+    Returns:
+        Real or imaginary part alone if the other is zero, otherwise "(a+bj)"
+    """
+    if amplitude.real != 0 and amplitude.imag != 0:
+        return f"({amplitude.real:.4f}{'+' if amplitude.imag > 0 else ''}{amplitude.imag:.4f}j)"
+    elif amplitude.real != 0:
+        return f"{amplitude.real:.4f}"
+    return f"{amplitude.imag:.4f}j"
+
+
+def _circuit_key(circuit: QuantumCircuit) -> tuple:
+    """
+    Build a hashable structural key for a circuit.
+    
+    Args:
+        circuit: Quantum circuit to describe
+        
+    Returns:
+        Tuple of (gate name, parameters, qubits, clbits) for every instruction,
+        followed by the register sizes
+    """
+    instructions = tuple(
+        (
+            inst.operation.name,
+            tuple(p.tobytes() if isinstance(p, np.ndarray) else p for p in inst.operation.params),
+            tuple(circuit.find_bit(q).index for q in inst.qubits),
+            tuple(circuit.find_bit(c).index for c in inst.clbits),
+        )
+        for inst in circuit.data
+    )
+    return instructions + (circuit.num_qubits, circuit.num_clbits)
+
 
 class EntanglementGenerator:
     """
     A class to generate and manipulate entangled quantum states.
     """
     
-    def __init__(self):
-        """Initialize the entanglement generator."""
-        self.simulator = Aer.get_backend('aer_simulator')
-        self.statevector_sim = Aer.get_backend('statevector_simulator')
+    def __init__(self, simulator: Optional[AerSimulator] = None, simulate_states: bool = False,
+                 gpu_threshold: int = 16):
+        """
+        Initialize the entanglement generator.
+        
+        Args:
+            simulator: Backend used for measurements (default: a new Aer statevector
+                simulator with gate fusion enabled and one thread per CPU core).
+                Passing a shared backend avoids re-creating it for every generator.
+            simulate_states: If True, obtain statevectors by simulating the preparation
+                circuits and measurement counts by running circuits on Aer, instead
+                of using the known closed-form amplitudes and sampling from them
+            gpu_threshold: Minimum number of qubits for which simulations run on a
+                GPU Aer backend, when one is available. Smaller circuits always stay
+                on the CPU, where GPU start-up overhead would dominate.
+        """
+        if simulator is None:
+            simulator = AerSimulator(
+                method='statevector',
+                fusion_enable=True,
+                fusion_threshold=_FUSION_MIN_QUBITS,
+                max_parallel_threads=os.cpu_count() or 0
+            )
+        self.simulator = simulator
+        self.simulate_states = simulate_states
+        self.gpu_threshold = gpu_threshold
+        self._gpu_simulator = None
+        self.rng = np.random.default_rng()
+        # Transpiled circuits keyed on (circuit structure, backend name)
+        self._transpile_cache: Dict[Tuple[tuple, str], QuantumCircuit] = {}
         self.reset_state()
     
     def reset_state(self):
@@ -30,6 +207,30 @@ class EntanglementGenerator:
         self.circuit = None
         self.statevector = None
         self.measured_results = None
+        self._num_qubits = 0
+        # Measurement circuits for the current state, keyed on (basis, qubit indices)
+        self._measurement_circuits: Dict[tuple, QuantumCircuit] = {}
+    
+    @property
+    def num_qubits(self) -> int:
+        """Number of qubits in the current state (0 if no state has been created)."""
+        return self._num_qubits
+    
+    @property
+    def statevector(self) -> Optional[Statevector]:
+        """Statevector of the current state (None if no state has been created)."""
+        return self._statevector
+    
+    @statevector.setter
+    def statevector(self, statevector: Optional[Statevector]):
+        # Keep contiguous real/imaginary copies for kernels that never need complex arithmetic
+        self._statevector = statevector
+        if statevector is None:
+            self._sv_re = self._sv_im = None
+        else:
+            amplitudes = np.asarray(statevector)
+            self._sv_re = np.ascontiguousarray(amplitudes.real, dtype=np.float64)
+            self._sv_im = np.ascontiguousarray(amplitudes.imag, dtype=np.float64)
     
     def create_bell_state(self, bell_type: str = 'phi_plus') -> QuantumCircuit:
         """
@@ -41,6 +242,9 @@ class EntanglementGenerator:
         Returns:
             Quantum circuit with the Bell state
         """
+        if bell_type not in _BELL_STATES:
+            raise ValueError(f"Invalid Bell state type: {bell_type}")
+        
         # Create a circuit with 2 qubits
         circuit = QuantumCircuit(2, 2)
         
@@ -62,8 +266,7 @@ class EntanglementGenerator:
             circuit.x(1)
             circuit.z(1)
         
-        self.circuit = circuit
-        self._update_statevector()
+        self._set_state(circuit, _BELL_STATES[bell_type])
         
         return circuit
     
@@ -87,8 +290,11 @@ class EntanglementGenerator:
         for i in range(1, num_qubits):
             circuit.cx(0, i)
         
-        self.circuit = circuit
-        self._update_statevector()
+        # (|00...0⟩ + |11...1⟩)/√2
+        amplitudes = np.zeros(2 ** num_qubits, dtype=complex)
+        amplitudes[[0, -1]] = 1 / np.sqrt(2)
+        
+        self._set_state(circuit, amplitudes)
         
         return circuit
     
@@ -102,46 +308,158 @@ class EntanglementGenerator:
         Returns:
             Quantum circuit with the W state
         """
-        # This is a simplified implementation for 3 qubits
-        # For more qubits, a more complex circuit would be needed
-        if num_qubits != 3:
-            raise ValueError("This implementation only supports 3-qubit W states")
+        if num_qubits < 2:
+            raise ValueError("A W state requires at least 2 qubits")
         
-        # Create a circuit with 3 qubits
-        circuit = QuantumCircuit(3, 3)
+        # Create a circuit with the specified number of qubits
+        circuit = QuantumCircuit(num_qubits, num_qubits)
         
-        # Apply gates to create the W state |001⟩ + |010⟩ + |100⟩
-        # This is a simplified approach
-        circuit.ry(2 * np.arccos(1/np.sqrt(3)), 0)
-        circuit.cx(0, 1)
-        circuit.x(0)
-        circuit.ccx(0, 1, 2)
+        # Linear-depth construction with no multi-controlled gates: start from
+        # |0...01⟩, then at each step keep amplitude 1/√n on qubit i and pass the
+        # rest of the excitation to qubit i+1 (controlled RY followed by CNOT)
         circuit.x(0)
+        for i in range(num_qubits - 1):
+            circuit.cry(2 * np.arccos(np.sqrt(1 / (num_qubits - i))), i, i + 1)
+            circuit.cx(i + 1, i)
         
-        self.circuit = circuit
-        self._update_statevector()
+        # (|0...01⟩ + |0...10⟩ + ... + |10...0⟩)/√n
+        amplitudes = np.zeros(2 ** num_qubits, dtype=complex)
+        amplitudes[1 << np.arange(num_qubits)] = 1 / np.sqrt(num_qubits)
+        
+        self._set_state(circuit, amplitudes)
         
         return circuit
     
+    def load_state(self, circuit: QuantumCircuit, statevector: Any):
+        """
+        Load a previously prepared circuit and its statevector.
+        
+        This lets callers reuse a state that was already simulated (for example
+        one cached by the Streamlit app) without running the simulator again.
+        
+        Args:
+            circuit: Quantum circuit that prepares the state
+            statevector: Statevector produced by the circuit
+        """
+        self.circuit = circuit
+        self._measurement_circuits = {}
+        self.statevector = statevector
+        self._num_qubits = len(statevector).bit_length() - 1
+    
+    def _set_state(self, circuit: QuantumCircuit, amplitudes: np.ndarray):
+        """
+        Set the current circuit and its statevector.
+        
+        The statevector of every supported family is known analytically, so it is
+        written directly unless simulate_states was requested.
+        
+        Args:
+            circuit: Quantum circuit that prepares the state
+            amplitudes: Closed-form amplitudes of the state the circuit prepares
+        """
+        self.circuit = circuit
+        self._measurement_circuits = {}
+        if self.simulate_states:
+            self._update_statevector()
+        else:
+            self.statevector = Statevector(amplitudes)
+            self._num_qubits = circuit.num_qubits
+    
     def _update_statevector(self):
         """Update the statevector based on the current circuit."""
         if self.circuit is None:
             self.statevector = None
+            self._num_qubits = 0
             return
         
-        # Execute the circuit on the statevector simulator
-        transpiled_circuit = transpile(self.circuit, self.statevector_sim)
-        job = self.statevector_sim.run(transpiled_circuit)
-        result = job.result()
-        self.statevector = result.get_statevector()
+        gpu = self._gpu_backend(self.circuit.num_qubits)
+        if gpu is not None:
+            # Large circuit: run it on the GPU and save the final statevector
+            circuit = self.circuit.copy()
+            circuit.save_statevector()
+            result = gpu.run(self._transpile(circuit, gpu)).result()
+            self.statevector = result.get_statevector()
+        else:
+            # Simulate the circuit directly; no backend job is needed for a statevector
+            self.statevector = Statevector.from_instruction(self.circuit)
+        self._num_qubits = len(self.statevector).bit_length() - 1
+    
+    def _gpu_backend(self, num_qubits: int) -> Optional[AerSimulator]:
+        """
+        Get the GPU statevector backend for a circuit of the given size.
+        
+        Args:
+            num_qubits: Number of qubits in the circuit
+            
+        Returns:
+            GPU Aer backend, or None if the circuit is below gpu_threshold or no GPU is available
+        """
+        if num_qubits < self.gpu_threshold or not _gpu_available():
+            return None
+        if self._gpu_simulator is None:
+            self._gpu_simulator = AerSimulator(method='statevector', device='GPU')
+        return self._gpu_simulator
     
-    def measure_in_basis(self, basis: str = 'Z', qubit_indices: Optional[List[int]] = None) -> Dict[str, int]:
+    def _transpile(self, circuit: QuantumCircuit, backend) -> QuantumCircuit:
+        """
+        Transpile a circuit for a backend, reusing earlier results for identical circuits.
+        
+        Circuits that only use instructions the backend runs natively (the Bell/GHZ/W
+        preparations, basis-change unitaries and measurements on Aer) are returned as-is.
+        
+        Args:
+            circuit: Quantum circuit to transpile
+            backend: Target backend
+            
+        Returns:
+            Transpiled circuit
+        """
+        native = backend.target.operation_names
+        if all(instruction.operation.name in native for instruction in circuit.data):
+            return circuit
+        
+        key = (_circuit_key(circuit), backend.name)
+        if key not in self._transpile_cache:
+            self._transpile_cache[key] = transpile(circuit, backend, optimization_level=3)
+        return self._transpile_cache[key]
+    
+    def _measurement_circuit(self, basis_key: Any, unitary: Optional[np.ndarray],
+                             qubit_indices: List[int]) -> QuantumCircuit:
+        """
+        Get the current circuit followed by a basis change and measurements.
+        
+        Only the basis change and measurements are built per call, as a small tail
+        composed onto the preparation circuit; the result is reused until the state changes.
+        
+        Args:
+            basis_key: Hashable identifier of the measurement basis
+            unitary: Single-qubit basis-change unitary, or None to measure in Z
+            qubit_indices: Indices of qubits to measure
+            
+        Returns:
+            Measurement circuit
+        """
+        key = (basis_key, tuple(qubit_indices))
+        if key not in self._measurement_circuits:
+            tail = self.circuit.copy_empty_like()
+            if unitary is not None:
+                for q in qubit_indices:
+                    tail.unitary(unitary, [q], label='basischg')
+            for i, q in enumerate(qubit_indices):
+                tail.measure(q, i)
+            self._measurement_circuits[key] = self.circuit.compose(tail)
+        return self._measurement_circuits[key]
+    
+    def measure_in_basis(self, basis: str = 'Z', qubit_indices: Optional[List[int]] = None,
+                         sampled: bool = False) -> Dict[str, int]:
         """
         Measure the qubits in the specified basis.
         
         Args:
             basis: Measurement basis ('X', 'Y', 'Z')
             qubit_indices: Indices of qubits to measure (default: all qubits)
+            sampled: If True, draw 1024 shots (on Aer when simulate_states is set);
+                otherwise return the exact expected counts for 1024 shots
             
         Returns:
             Dictionary of measurement results
@@ -149,36 +467,30 @@ class EntanglementGenerator:
         if self.circuit is None:
             raise ValueError("No circuit has been created")
         
-        # Create a copy of the circuit for measurement
-        meas_circuit = self.circuit.copy()
-        num_qubits = meas_circuit.num_qubits
+        num_qubits = self.circuit.num_qubits
         
         # If no qubit indices are specified, measure all qubits
         if qubit_indices is None:
             qubit_indices = list(range(num_qubits))
         
-        # Apply basis change gates before measurement
-        for q in qubit_indices:
-            if basis == 'X':
-                meas_circuit.h(q)
-            elif basis == 'Y':
-                meas_circuit.sdg(q)  # S dagger gate
-                meas_circuit.h(q)
+        if not (sampled and self.simulate_states):
+            return self._counts_from_statevector(_BASIS_CHANGE.get(basis), qubit_indices, sampled)
         
-        # Add measurement
-        for i, q in enumerate(qubit_indices):
-            meas_circuit.measure(q, i)
+        # Apply basis change before measurement (H for X, H·S† for Y)
+        meas_circuit = self._measurement_circuit(basis, _BASIS_CHANGE.get(basis), qubit_indices)
         
         # Execute the circuit
-        transpiled_circuit = transpile(meas_circuit, self.simulator)
-        job = self.simulator.run(transpiled_circuit, shots=1024)
+        backend = self._gpu_backend(num_qubits) or self.simulator
+        transpiled_circuit = self._transpile(meas_circuit, backend)
+        job = backend.run(transpiled_circuit, shots=1024)
         result = job.result()
         counts = result.get_counts()
         
         self.measured_results = counts
         return counts
     
-    def measure_in_custom_basis(self, theta: float, phi: float, qubit_indices: Optional[List[int]] = None) -> Dict[str, int]:
+    def measure_in_custom_basis(self, theta: float, phi: float, qubit_indices: Optional[List[int]] = None,
+                                sampled: bool = False) -> Dict[str, int]:
         """
         Measure the qubits in a custom basis defined by angles on the Bloch sphere.
         
@@ -186,6 +498,8 @@ class EntanglementGenerator:
             theta: Polar angle (0 to π)
             phi: Azimuthal angle (0 to 2π)
             qubit_indices: Indices of qubits to measure (default: all qubits)
+            sampled: If True, draw 1024 shots (on Aer when simulate_states is set);
+                otherwise return the exact expected counts for 1024 shots
             
         Returns:
             Dictionary of measurement results
@@ -193,36 +507,91 @@ class EntanglementGenerator:
         if self.circuit is None:
             raise ValueError("No circuit has been created")
         
-        # Create a copy of the circuit for measurement
-        meas_circuit = self.circuit.copy()
-        num_qubits = meas_circuit.num_qubits
+        num_qubits = self.circuit.num_qubits
         
         # If no qubit indices are specified, measure all qubits
         if qubit_indices is None:
             qubit_indices = list(range(num_qubits))
         
-        # Apply rotation gates to change to the custom basis
-        for q in qubit_indices:
-            # First rotate around Y-axis by theta
-            meas_circuit.ry(theta, q)
-            # Then rotate around Z-axis by phi
-            meas_circuit.rz(phi, q)
-            # Finally, apply Hadamard to measure in the new basis
-            meas_circuit.h(q)
+        if not (sampled and self.simulate_states):
+            return self._counts_from_statevector(_custom_basis_unitary(theta, phi), qubit_indices, sampled)
         
-        # Add measurement
-        for i, q in enumerate(qubit_indices):
-            meas_circuit.measure(q, i)
+        # Rotate into the custom basis: RY(theta), then RZ(phi), then H
+        meas_circuit = self._measurement_circuit((theta, phi), _custom_basis_unitary(theta, phi),
+                                                 qubit_indices)
         
         # Execute the circuit
-        transpiled_circuit = transpile(meas_circuit, self.simulator)
-        job = self.simulator.run(transpiled_circuit, shots=1024)
+        backend = self._gpu_backend(num_qubits) or self.simulator
+        transpiled_circuit = self._transpile(meas_circuit, backend)
+        job = backend.run(transpiled_circuit, shots=1024)
         result = job.result()
         counts = result.get_counts()
         
         self.measured_results = counts
         return counts
     
+    def _counts_from_statevector(self, rotation: Optional[np.ndarray], qubit_indices: List[int],
+                                 sampled: bool, shots: int = 1024) -> Dict[str, int]:
+        """
+        Compute measurement counts directly from the statevector.
+        
+        Args:
+            rotation: Single-qubit basis-change unitary applied to every measured
+                qubit (None for the computational basis)
+            qubit_indices: Indices of qubits to measure; qubit_indices[i] is
+                recorded in classical bit i, as in the measurement circuits
+            sampled: If True, draw the shots at random; otherwise return the
+                expected counts (probabilities scaled by shots and rounded so
+                they still sum to shots)
+            shots: Number of measurement shots
+            
+        Returns:
+            Dictionary of measurement results
+        """
+        psi = np.asarray(self.statevector)
+        
+        # Rotate the measured qubits into the computational basis one axis at a time,
+        # O(n·2^n) instead of building the 2^n x 2^n Kronecker product
+        if rotation is not None:
+            num_qubits = self.num_qubits
+            unitary = rotation.astype(np.complex64)
+            tensor = psi.astype(np.complex64).reshape((2,) * num_qubits)
+            for q in qubit_indices:
+                # Axis 0 is the most significant (highest) qubit
+                axis = num_qubits - 1 - q
+                tensor = np.moveaxis(np.tensordot(unitary, tensor, axes=([1], [axis])), 0, axis)
+            psi = tensor.reshape(-1)
+        
+        # Normalize in double precision so the multinomial sees probabilities summing to 1
+        probabilities = np.abs(psi).astype(np.float64) ** 2
+        probabilities /= probabilities.sum()
+        
+        # Marginalize onto the measured qubits: basis index -> classical register value
+        indices = np.arange(len(probabilities))
+        values = np.zeros_like(indices)
+        for i, q in enumerate(qubit_indices):
+            values |= ((indices >> q) & 1) << i
+        marginal = np.bincount(values, weights=probabilities, minlength=2 ** len(qubit_indices))
+        
+        if sampled:
+            outcomes = self.rng.multinomial(shots, marginal / marginal.sum())
+        else:
+            # Largest-remainder rounding: floor every count, then hand the leftover
+            # shots to the outcomes with the largest fractional parts so the total is exact
+            expected = marginal / marginal.sum() * shots
+            outcomes = np.floor(expected).astype(int)
+            leftover = shots - int(outcomes.sum())
+            if leftover > 0:
+                outcomes[np.argsort(outcomes - expected, kind='stable')[:leftover]] += 1
+        
+        # Format as the bitstring counts Aer would return
+        num_clbits = self.circuit.num_clbits
+        counts = {format(int(value), f'0{num_clbits}b'): int(outcomes[value])
+                  for value in np.flatnonzero(outcomes)}
+        
+        self.measured_results = counts
+        return counts
+    
     def get_density_matrix(self) -> np.ndarray:
         """
         Get the density matrix of the quantum state.
@@ -233,12 +602,9 @@ class EntanglementGenerator:
         if self.statevector is None:
             raise ValueError("No statevector available")
         
-        # Convert statevector to density matrix
-        sv = np.array(self.statevector)
-        # Reshape to column vector
-        sv_col = sv.reshape(-1, 1)
-        # Compute density matrix as |ψ⟩⟨ψ|
-        rho = np.dot(sv_col, sv_col.conj().T)
+        # Compute density matrix as |ψ⟩⟨ψ| (single outer-product allocation)
+        sv = np.asarray(self.statevector)
+        rho = np.outer(sv, sv.conj())
         
         return rho
     
@@ -255,19 +621,23 @@ class EntanglementGenerator:
         if self.statevector is None:
             raise ValueError("No statevector available")
         
-        # Create a Statevector object
-        sv = Statevector(self.statevector)
-        
-        # Get the number of qubits
-        num_qubits = int(np.log2(len(self.statevector)))
+        num_qubits = self.num_qubits
+        keep = sorted(set(keep_indices))
+        if not keep or keep[0] < 0 or keep[-1] >= num_qubits:
+            raise ValueError(f"Invalid qubit indices {keep_indices} for a {num_qubits}-qubit state")
         
-        # Determine which qubits to trace out
-        trace_indices = [i for i in range(num_qubits) if i not in keep_indices]
+        # Trace directly from ψ, never forming the 4^n full density matrix:
+        # O(2^n) memory and O(2^(n+K)) time for K kept qubits.
+        # View ψ as a rank-n tensor; axis k holds qubit n-1-k (little-endian)
+        psi = np.asarray(self.statevector).reshape((2,) * num_qubits)
+        keep_axes = [num_qubits - 1 - q for q in reversed(keep)]
         
-        # Compute the reduced density matrix
-        reduced_dm = partial_trace(sv, trace_indices)
+        # Group the kept qubits into rows and the traced-out qubits into columns,
+        # so that ρ_keep = A A† (kept qubits stay in ascending little-endian order)
+        A = np.moveaxis(psi, keep_axes, range(len(keep_axes))).reshape(2 ** len(keep), -1)
+        reduced_dm = A @ A.conj().T
         
-        return reduced_dm.data
+        return reduced_dm
     
     def get_concurrence(self) -> float:
         """
@@ -287,20 +657,15 @@ class EntanglementGenerator:
         rho = self.get_density_matrix()
         
         # Define the spin-flipped density matrix
-        sigma_y = np.array([[0, -1j], [1j, 0]])
-        sigma_y_tensor = np.kron(sigma_y, sigma_y)
-        rho_tilde = np.dot(sigma_y_tensor, np.dot(np.conj(rho), sigma_y_tensor))
-        
-        # Calculate R = sqrt(sqrt(rho) * rho_tilde * sqrt(rho))
-        sqrt_rho = np.sqrt(rho)
-        R = np.dot(sqrt_rho, np.dot(rho_tilde, sqrt_rho))
+        rho_tilde = np.dot(_SIGMA_YY, np.dot(np.conj(rho), _SIGMA_YY))
         
-        # Get eigenvalues of R
-        eigenvalues = np.linalg.eigvals(R)
-        eigenvalues = np.sort(np.abs(eigenvalues))[::-1]  # Sort in descending order
+        # Wootters: the eigenvalues of rho * rho_tilde are the squares of the λ_i,
+        # so a single 4x4 eigendecomposition is enough (no matrix square root)
+        eigenvalues = np.sqrt(np.abs(np.linalg.eigvals(np.dot(rho, rho_tilde))))
+        eigenvalues = np.sort(eigenvalues)[::-1]  # Sort in descending order
         
         # Calculate concurrence
-        concurrence = max(0, eigenvalues[0] - eigenvalues[1] - eigenvalues[2] - eigenvalues[3])
+        concurrence = float(max(0.0, eigenvalues[0] - eigenvalues[1] - eigenvalues[2] - eigenvalues[3]))
         
         return concurrence
     
@@ -317,47 +682,23 @@ class EntanglementGenerator:
         if self.circuit is None or self.statevector is None:
             raise ValueError("No quantum state available")
         
-        # Check if we have at least two qubits
-        num_qubits = int(np.log2(len(self.statevector)))
-        if num_qubits < 2:
-            raise ValueError("Correlation matrix requires at least two qubits")
-        
-        # Initialize correlation matrix
-        n_bases = len(bases)
-        corr_matrix = np.zeros((n_bases, n_bases))
-        
-        # Calculate correlations for each pair of bases
-        for i, basis1 in enumerate(bases):
-            for j, basis2 in enumerate(bases):
-                # Measure qubit 0 in basis1 and qubit 1 in basis2
-                # This is a simplified calculation
-                if basis1 == 'X' and basis2 == 'X':
-                    # ⟨XX⟩
-                    corr_matrix[i, j] = self._get_pauli_expectation('XX')
-                elif basis1 == 'X' and basis2 == 'Y':
-                    # ⟨XY⟩
-                    corr_matrix[i, j] = self._get_pauli_expectation('XY')
-                elif basis1 == 'X' and basis2 == 'Z':
-                    # ⟨XZ⟩
-                    corr_matrix[i, j] = self._get_pauli_expectation('XZ')
-                elif basis1 == 'Y' and basis2 == 'X':
-                    # ⟨YX⟩
-                    corr_matrix[i, j] = self._get_pauli_expectation('YX')
-                elif basis1 == 'Y' and basis2 == 'Y':
-                    # ⟨YY⟩
-                    corr_matrix[i, j] = self._get_pauli_expectation('YY')
-                elif basis1 == 'Y' and basis2 == 'Z':
-                    # ⟨YZ⟩
-                    corr_matrix[i, j] = self._get_pauli_expectation('YZ')
-                elif basis1 == 'Z' and basis2 == 'X':
-                    # ⟨ZX⟩
-                    corr_matrix[i, j] = self._get_pauli_expectation('ZX')
-                elif basis1 == 'Z' and basis2 == 'Y':
-                    # ⟨ZY⟩
-                    corr_matrix[i, j] = self._get_pauli_expectation('ZY')
-                elif basis1 == 'Z' and basis2 == 'Z':
-                    # ⟨ZZ⟩
-                    corr_matrix[i, j] = self._get_pauli_expectation('ZZ')
+        # The Pauli pair operators act on exactly two qubits
+        if self.num_qubits != 2:
+            raise ValueError("Correlation matrix is only available for two-qubit states")
+        
+        unknown = [basis for basis in bases if basis not in _CORRELATION_BASES]
+        if unknown:
+            raise ValueError(f"Invalid bases: {unknown}. Must be 'X', 'Y', or 'Z'")
+        
+        # ⟨ψ|P_i ⊗ P_j|ψ⟩ for all nine pairs in one pass over the statevector
+        psi = np.asarray(self.statevector).astype(np.complex64, copy=False)
+        all_corr = np.einsum('i,abij,j->ab', psi.conj(), _PAULI_PAIRS, psi).real
+        
+        # Select the requested bases (the full matrix needs no copy)
+        if ''.join(bases) == _CORRELATION_BASES:
+            return all_corr
+        indices = [_CORRELATION_BASES.index(basis) for basis in bases]
+        corr_matrix = all_corr[np.ix_(indices, indices)]
         
         return corr_matrix
     
@@ -374,27 +715,15 @@ class EntanglementGenerator:
         if self.statevector is None:
             raise ValueError("No statevector available")
         
-        # Create a Statevector object
-        sv = Statevector(self.statevector)
+        if len(pauli_string) != self.num_qubits:
+            raise ValueError(f"Pauli string '{pauli_string}' does not match the {self.num_qubits}-qubit state")
         
-        # Define Pauli matrices
-        I = np.array([[1, 0], [0, 1]])
-        X = np.array([[0, 1], [1, 0]])
-        Y = np.array([[0, -1j], [1j, 0]])
-        Z = np.array([[1, 0], [0, -1]])
+        # Calculate expectation value ⟨ψ|P|ψ⟩ = Σ_j conj(ψ[j ⊕ x]) · phase[j] · ψ[j]
+        psi = np.asarray(self.statevector)
+        flipped, phases = _pauli_action(pauli_string)
+        expectation = np.vdot(psi[flipped], phases * psi)
         
-        # Map characters to Pauli matrices
-        pauli_map = {'I': I, 'X': X, 'Y': Y, 'Z': Z}
-        
-        # Build the operator
-        op = np.array(1)
-        for char in pauli_string:
-            op = np.kron(op, pauli_map[char])
-        
-        # Calculate expectation value
-        expectation = sv.expectation_value(op)
-        
-        return expectation.real
+        return float(expectation.real)
     
     def get_bell_inequality_value(self) -> float:
         """
@@ -406,28 +735,15 @@ class EntanglementGenerator:
         if self.statevector is None:
             raise ValueError("No statevector available")
         
-        # Calculate the terms in the CHSH inequality
-        # S = E(A,B) - E(A,B') + E(A',B) + E(A',B')
-        # where A, A' are measurements on the first qubit
-        # and B, B' are measurements on the second qubit
+        if self.num_qubits != 2:
+            raise ValueError("Bell inequality value is only available for two-qubit states")
         
-        # For Bell states, we can use specific measurement settings
-        # that maximize the violation
-        
-        # E(A,B): Both qubits measured in Z basis
-        E_AB = self._get_pauli_expectation('ZZ')
-        
-        # E(A,B'): First qubit in Z basis, second in X basis
-        E_ABp = self._get_pauli_expectation('ZX')
-        
-        # E(A',B): First qubit in X basis, second in Z basis
-        E_ApB = self._get_pauli_expectation('XZ')
-        
-        # E(A',B'): Both qubits measured in X basis
-        E_ApBp = self._get_pauli_expectation('XX')
-        
-        # Calculate the CHSH value
-        chsh = abs(E_AB - E_ABp + E_ApB + E_ApBp)
+        # S = E(A,B) - E(A,B') + E(A',B) + E(A',B')
+        # where A = Z, A' = X are measurements on the first qubit
+        # and B = Z, B' = X are measurements on the second qubit.
+        # All four terms are folded into a single ⟨ψ|S|ψ⟩.
+        psi = np.asarray(self.statevector)
+        chsh = float(abs(np.vdot(psi, _CHSH_OP @ psi).real))
         
         return chsh
     
@@ -456,6 +772,8 @@ class EntanglementGenerator:
         if self.statevector is None:
             raise ValueError("No statevector available")
         
+        # Imported lazily: qiskit.visualization pulls in matplotlib
+        from qiskit.visualization import plot_bloch_multivector
         return plot_bloch_multivector(self.statevector)
     
     def get_histogram_figure(self, counts: Optional[Dict[str, int]] = None):
@@ -474,6 +792,8 @@ class EntanglementGenerator:
         if counts is None:
             raise ValueError("No measurement results available")
         
+        # Imported lazily: qiskit.visualization pulls in matplotlib
+        from qiskit.visualization import plot_histogram
         return plot_histogram(counts)
     
     def get_state_vector_representation(self) -> str:
@@ -486,33 +806,16 @@ class EntanglementGenerator:
         if self.statevector is None:
             raise ValueError("No statevector available")
         
-        # Format the statevector as a string
-        n_qubits = int(np.log2(len(self.statevector)))
-        state_str = ""
-        
         # Threshold for considering an amplitude as zero
         threshold = 1e-10
         
-        for i, amplitude in enumerate(self.statevector):
-            if abs(amplitude) > threshold:
-                # Convert index to binary representation (the basis state)
-                basis_state = format(i, f'0{n_qubits}b')
-                
-                # Format the complex amplitude
-                if amplitude.real == 0 and amplitude.imag == 0:
-                    continue
-                
-                term = ""
-                if amplitude.real != 0 and amplitude.imag != 0:
-                    term = f"({amplitude.real:.4f}{'+' if amplitude.imag > 0 else ''}{amplitude.imag:.4f}j)"
-                elif amplitude.real != 0:
-                    term = f"{amplitude.real:.4f}"
-                else:
-                    term = f"{amplitude.imag:.4f}j"
-                
-                if state_str:
-                    state_str += " + "
-                
-                state_str += f"{term}|{basis_state}⟩"
+        # Find the non-negligible amplitudes in one vectorized pass, then only
+        # format those (e.g. two terms for a GHZ state regardless of size)
+        re, im = self._sv_re, self._sv_im
+        indices = np.flatnonzero(re * re + im * im > threshold * threshold)
+        n_qubits = self.num_qubits
+        state_str = " + ".join(
+            f"{_format_amplitude(complex(re[i], im[i]))}|{i:0{n_qubits}b}⟩" for i in indices
+        )
         
         return state_str
\ No newline at end of file
@@ -7,12 +7,121 @@ correlation matrices, Bloch sphere representations, and interactive plots.
 
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+import textwrap
 import plotly.graph_objects as go
-import plotly.express as px
 from plotly.subplots import make_subplots
 from typing import Dict, List, Tuple, Optional, Union, Any
-import pandas as pd
+from functools import lru_cache
+
+
+def _sphere_mesh(resolution: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the surface mesh of a unit sphere.
+    
+    Args:
+        resolution: Number of grid points along each angle
+        
+    Returns:
+        Tuple of (x, y, z) float32 coordinate grids (read-only)
+    """
+    u = np.linspace(0, 2 * np.pi, resolution)
+    v = np.linspace(0, np.pi, resolution)
+    
+    x_sphere = np.outer(np.cos(u), np.sin(v))
+    y_sphere = np.outer(np.sin(u), np.sin(v))
+    z_sphere = np.outer(np.ones(np.size(u)), np.cos(v))
+    # Single precision halves the mesh payload sent to the browser
+    grids = tuple(grid.astype(np.float32) for grid in (x_sphere, y_sphere, z_sphere))
+    for grid in grids:
+        grid.setflags(write=False)
+    return grids
+
+
+# The sphere geometry never changes, so the meshes are built once at import and
+# shared (read-only) by every Bloch sphere figure
+_SPHERE_100 = _sphere_mesh(100)
+_SPHERE_50 = _sphere_mesh(50)
+
+# Bloch sphere frame: the X (red), Y (green) and Z (blue) axes as one multi-segment
+# line, with None gaps between segments and per-vertex colors mapped through a colorscale.
+# The Z axis gets two extra collinear vertices at the poles to carry the |1⟩/|0⟩ labels.
+_AXIS_LENGTH = 1.2
+_POLE = 1.1
+_FRAME_X = [-_AXIS_LENGTH, _AXIS_LENGTH, None, 0, 0, None, 0, 0, 0, 0]
+_FRAME_Y = [0, 0, None, -_AXIS_LENGTH, _AXIS_LENGTH, None, 0, 0, 0, 0]
+_FRAME_Z = [0, 0, None, 0, 0, None, -_AXIS_LENGTH, -_POLE, _POLE, _AXIS_LENGTH]
+_FRAME_COLORS = [0, 0, 0, 1, 1, 1, 2, 2, 2, 2]
+_FRAME_NAMES = ['X-axis'] * 3 + ['Y-axis'] * 3 + ['Z-axis'] * 4
+_FRAME_TEXT = [''] * 7 + ['|1⟩', '|0⟩', '']
+
+# Scene and margins shared by every Bloch sphere figure (Plotly copies them on use)
+_BLOCH_SCENE = dict(
+    xaxis=dict(range=[-_AXIS_LENGTH, _AXIS_LENGTH], showticklabels=False),
+    yaxis=dict(range=[-_AXIS_LENGTH, _AXIS_LENGTH], showticklabels=False),
+    zaxis=dict(range=[-_AXIS_LENGTH, _AXIS_LENGTH], showticklabels=False),
+    aspectmode='cube'
+)
+_BLOCH_MARGIN = dict(l=0, r=0, b=0, t=40)
+
+
+def _add_frame(fig: go.Figure, row: Optional[int] = None, col: Optional[int] = None):
+    """
+    Add the coordinate axes and pole labels of a Bloch sphere to a figure as one trace.
+    
+    Args:
+        fig: Figure to add the trace to
+        row, col: Subplot position (None for a single-scene figure)
+    """
+    fig.add_trace(go.Scatter3d(
+        x=_FRAME_X,
+        y=_FRAME_Y,
+        z=_FRAME_Z,
+        mode='lines+text',
+        line=dict(
+            color=_FRAME_COLORS,
+            colorscale=[[0, 'red'], [0.5, 'green'], [1, 'blue']],
+            cmin=0,
+            cmax=2,
+            width=3
+        ),
+        text=_FRAME_TEXT,
+        textposition='top center',
+        textfont=dict(size=14),
+        hovertext=_FRAME_NAMES,
+        hoverinfo='text',
+        showlegend=False
+    ), row=row, col=col)
+
+
+def _to_f32(values: Any) -> np.ndarray:
+    """
+    Convert plot data to a contiguous float32 array.
+    
+    Single precision is visually identical in a colour scale and halves the
+    figure payload sent to the browser.
+    
+    Args:
+        values: Array-like plot data
+        
+    Returns:
+        Contiguous float32 NumPy array
+    """
+    return np.ascontiguousarray(values, dtype=np.float32)
+
+
+@lru_cache(maxsize=8)
+def _basis_labels(n: int) -> Tuple[str, ...]:
+    """
+    Get the computational basis labels of an n-dimensional state space.
+    
+    Args:
+        n: Dimension of the state space (a power of 2)
+        
+    Returns:
+        Bitstring labels, e.g. ('00', '01', '10', '11') for n = 4
+    """
+    basis_size = n.bit_length() - 1
+    return tuple(format(i, f'0{basis_size}b') for i in range(n))
 
 
 def plot_correlation_matrix(correlation_matrix: np.ndarray, bases: List[str] = ['X', 'Y', 'Z']) -> go.Figure:
@@ -28,7 +137,7 @@ def plot_correlation_matrix(correlation_matrix: np.ndarray, bases: List[str] = [
     """
     # Create a heatmap
     fig = go.Figure(data=go.Heatmap(
-        z=correlation_matrix,
+        z=_to_f32(correlation_matrix),
         x=bases,
         y=bases,
         colorscale='RdBu',
@@ -64,20 +173,16 @@ def plot_measurement_results(counts: Dict[str, int], shots: int) -> go.Figure:
     Returns:
         Plotly figure object
     """
-    # Calculate probabilities
-    probabilities = {state: count / shots for state, count in counts.items()}
-    
-    # Sort by state
-    sorted_items = sorted(probabilities.items(), key=lambda x: x[0])
-    states = [item[0] for item in sorted_items]
-    probs = [item[1] for item in sorted_items]
+    # Sort by state, then calculate all probabilities in one vectorized division
+    states = sorted(counts)
+    probs = np.fromiter((counts[state] for state in states), dtype=np.float64, count=len(states)) / shots
     
     # Create a bar chart
     fig = go.Figure(data=go.Bar(
         x=states,
         y=probs,
         marker_color='royalblue',
-        text=[f"{p:.3f}" for p in probs],
+        text=np.char.mod('%.3f', probs).tolist(),
         textposition='auto'
     ))
     
@@ -108,18 +213,15 @@ def plot_bloch_sphere(x: float, y: float, z: float, title: str = "Bloch Sphere")
     fig = go.Figure()
     
     # Add the Bloch sphere (a unit sphere)
-    u = np.linspace(0, 2 * np.pi, 100)
-    v = np.linspace(0, np.pi, 100)
-    
-    x_sphere = np.outer(np.cos(u), np.sin(v))
-    y_sphere = np.outer(np.sin(u), np.sin(v))
-    z_sphere = np.outer(np.ones(np.size(u)), np.cos(v))
+    x_sphere, y_sphere, z_sphere = _SPHERE_100
     
     fig.add_trace(go.Surface(
         x=x_sphere, y=y_sphere, z=z_sphere,
         opacity=0.3,
         colorscale=[[0, 'rgb(200, 200, 200)'], [1, 'rgb(240, 240, 240)']],
-        showscale=False
+        showscale=False,
+        hoverinfo='skip',
+        lighting=dict(ambient=1, diffuse=0, specular=0)
     ))
     
     # Add the state vector
@@ -132,63 +234,16 @@ def plot_bloch_sphere(x: float, y: float, z: float, title: str = "Bloch Sphere")
         marker=dict(size=[0, 8], color='red')
     ))
     
-    # Add axis lines
-    axis_length = 1.2
-    
-    # X-axis (red)
-    fig.add_trace(go.Scatter3d(
-        x=[-axis_length, axis_length],
-        y=[0, 0],
-        z=[0, 0],
-        mode='lines',
-        line=dict(color='red', width=3),
-        name='X-axis'
-    ))
-    
-    # Y-axis (green)
-    fig.add_trace(go.Scatter3d(
-        x=[0, 0],
-        y=[-axis_length, axis_length],
-        z=[0, 0],
-        mode='lines',
-        line=dict(color='green', width=3),
-        name='Y-axis'
-    ))
-    
-    # Z-axis (blue)
-    fig.add_trace(go.Scatter3d(
-        x=[0, 0],
-        y=[0, 0],
-        z=[-axis_length, axis_length],
-        mode='lines',
-        line=dict(color='blue', width=3),
-        name='Z-axis'
-    ))
-    
-    # Add labels for the poles
-    fig.add_trace(go.Scatter3d(
-        x=[0, 0],
-        y=[0, 0],
-        z=[1.1, -1.1],
-        mode='text',
-        text=['|0⟩', '|1⟩'],
-        textposition='top center',
-        textfont=dict(size=14),
-        showlegend=False
-    ))
+    # Add the axes and pole labels
+    _add_frame(fig)
     
     # Update layout
     fig.update_layout(
         title=title,
-        scene=dict(
-            xaxis=dict(range=[-1.2, 1.2], showticklabels=False),
-            yaxis=dict(range=[-1.2, 1.2], showticklabels=False),
-            zaxis=dict(range=[-1.2, 1.2], showticklabels=False),
-            aspectmode='cube'
-        ),
+        scene=_BLOCH_SCENE,
         width=500,
         height=500,
-        margin=dict(l=0, r=0, b=0, t=40)
+        margin=_BLOCH_MARGIN
     )
     
     return fig
@@ -215,18 +270,16 @@ def plot_dual_bloch_spheres(bloch1: Tuple[float, float, float], bloch2: Tuple[fl
     # Add Bloch spheres and vectors
     for i, (x, y, z) in enumerate([(bloch1), (bloch2)], 1):
         # Add the Bloch sphere (a unit sphere)
-        u = np.linspace(0, 2 * np.pi, 50)
-        v = np.linspace(0, np.pi, 50)
-        
-        x_sphere = np.outer(np.cos(u), np.sin(v))
-        y_sphere = np.outer(np.sin(u), np.sin(v))
-        z_sphere = np.outer(np.ones(np.size(u)), np.cos(v))
+        x_sphere, y_sphere, z_sphere = _SPHERE_50
         
         fig.add_trace(go.Surface(
             x=x_sphere, y=y_sphere, z=z_sphere,
             opacity=0.3,
             colorscale=[[0, 'rgb(200, 200, 200)'], [1, 'rgb(240, 240, 240)']],
-            showscale=False
+            showscale=False,
+            # Flat shading and no hover: the sphere is only a translucent backdrop
+            hoverinfo='skip',
+            lighting=dict(ambient=1, diffuse=0, specular=0)
         ), row=1, col=i)
         
         # Add the state vector
@@ -240,72 +293,17 @@ def plot_dual_bloch_spheres(bloch1: Tuple[float, float, float], bloch2: Tuple[fl
             showlegend=False
         ), row=1, col=i)
         
-        # Add axis lines
-        axis_length = 1.2
-        
-        # X-axis (red)
-        fig.add_trace(go.Scatter3d(
-            x=[-axis_length, axis_length],
-            y=[0, 0],
-            z=[0, 0],
-            mode='lines',
-            line=dict(color='red', width=3),
-            name='X-axis' if i == 1 else None,
-            showlegend=i == 1
-        ), row=1, col=i)
-        
-        # Y-axis (green)
-        fig.add_trace(go.Scatter3d(
-            x=[0, 0],
-            y=[-axis_length, axis_length],
-            z=[0, 0],
-            mode='lines',
-            line=dict(color='green', width=3),
-            name='Y-axis' if i == 1 else None,
-            showlegend=i == 1
-        ), row=1, col=i)
-        
-        # Z-axis (blue)
-        fig.add_trace(go.Scatter3d(
-            x=[0, 0],
-            y=[0, 0],
-            z=[-axis_length, axis_length],
-            mode='lines',
-            line=dict(color='blue', width=3),
-            name='Z-axis' if i == 1 else None,
-            showlegend=i == 1
-        ), row=1, col=i)
-        
-        # Add labels for the poles
-        fig.add_trace(go.Scatter3d(
-            x=[0, 0],
-            y=[0, 0],
-            z=[1.1, -1.1],
-            mode='text',
-            text=['|0⟩', '|1⟩'],
-            textposition='top center',
-            textfont=dict(size=14),
-            showlegend=False
-        ), row=1, col=i)
+        # Add the axes and pole labels
+        _add_frame(fig, row=1, col=i)
     
     # Update layout
     fig.update_layout(
         title="Bloch Sphere Representation",
-        scene=dict(
-            xaxis=dict(range=[-1.2, 1.2], showticklabels=False),
-            yaxis=dict(range=[-1.2, 1.2], showticklabels=False),
-            zaxis=dict(range=[-1.2, 1.2], showticklabels=False),
-            aspectmode='cube'
-        ),
-        scene2=dict(
-            xaxis=dict(range=[-1.2, 1.2], showticklabels=False),
-            yaxis=dict(range=[-1.2, 1.2], showticklabels=False),
-            zaxis=dict(range=[-1.2, 1.2], showticklabels=False),
-            aspectmode='cube'
-        ),
+        scene=_BLOCH_SCENE,
+        scene2=_BLOCH_SCENE,
         width=1000,
         height=500,
-        margin=dict(l=0, r=0, b=0, t=40)
+        margin=_BLOCH_MARGIN
     )
     
     return fig
@@ -416,19 +414,11 @@ def plot_density_matrix(density_matrix: np.ndarray, title: str = "Density Matrix
     """
     # Get dimensions
     n = density_matrix.shape[0]
-    basis_size = int(np.log2(n))
-    
-    # Create basis labels
-    basis_labels = [format(i, f'0{basis_size}b') for i in range(n)]
+    basis_labels = _basis_labels(n)
     
-    # Extract real and imaginary parts
-    real_part = density_matrix.real
-    imag_part = density_matrix.imag
-    
-    # Create meshgrid for x and y coordinates
-    x, y = np.meshgrid(range(n), range(n))
-    x = x.flatten()
-    y = y.flatten()
+    # Extract real and imaginary parts (single precision is plenty for rendering)
+    real_part = _to_f32(density_matrix.real)
+    imag_part = _to_f32(density_matrix.imag)
     
     # Create figure with two subplots
     fig = make_subplots(
@@ -488,42 +478,20 @@ def plot_measurement_correlations(results: Dict[str, int], shots: int) -> go.Fig
     Returns:
         Plotly figure object
     """
-    # Check if we have a two-qubit state
-    if all(len(state) == 2 for state in results.keys()):
-        # Extract individual qubit results
-        q0_0_count = sum(results.get(f"0{b}", 0) for b in ["0", "1"])
-        q0_1_count = sum(results.get(f"1{b}", 0) for b in ["0", "1"])
-        q1_0_count = sum(results.get(f"{a}0", 0) for a in ["0", "1"])
-        q1_1_count = sum(results.get(f"{a}1", 0) for a in ["0", "1"])
-        
-        # Calculate joint probabilities
-        p00 = results.get("00", 0) / shots
-        p01 = results.get("01", 0) / shots
-        p10 = results.get("10", 0) / shots
-        p11 = results.get("11", 0) / shots
+    # Check if we have a two-qubit state; every outcome has the register's width,
+    # so the first key is enough
+    if results and len(next(iter(results))) == 2:
+        # Joint probabilities as a 2x2 matrix: rows are qubit 0, columns qubit 1
+        counts = np.zeros(4, dtype=np.int64)
+        for state, count in results.items():
+            counts[int(state, 2)] = count
+        actual = counts.reshape(2, 2) / shots
         
-        # Calculate marginal probabilities
-        p0_0 = q0_0_count / shots
-        p0_1 = q0_1_count / shots
-        p1_0 = q1_0_count / shots
-        p1_1 = q1_1_count / shots
-        
-        # Calculate expected joint probabilities (if independent)
-        e00 = p0_0 * p1_0
-        e01 = p0_0 * p1_1
-        e10 = p0_1 * p1_0
-        e11 = p0_1 * p1_1
+        # Expected joint probabilities if the qubits were independent
+        expected = np.outer(actual.sum(axis=1), actual.sum(axis=0))
         
         # Calculate correlation
-        correlation = p00 + p11 - p01 - p10
-        
-        # Create a dataframe for the heatmap
-        joint_probs = pd.DataFrame([
-            {"Qubit 0": "0", "Qubit 1": "0", "Actual": p00, "Expected": e00, "Difference": p00 - e00},
-            {"Qubit 0": "0", "Qubit 1": "1", "Actual": p01, "Expected": e01, "Difference": p01 - e01},
-            {"Qubit 0": "1", "Qubit 1": "0", "Actual": p10, "Expected": e10, "Difference": p10 - e10},
-            {"Qubit 0": "1", "Qubit 1": "1", "Actual": p11, "Expected": e11, "Difference": p11 - e11}
-        ])
+        correlation = actual[0, 0] + actual[1, 1] - actual[0, 1] - actual[1, 0]
         
         # Create a figure with subplots
         fig = make_subplots(
@@ -535,7 +503,7 @@ def plot_measurement_correlations(results: Dict[str, int], shots: int) -> go.Fig
         # Add heatmaps
         fig.add_trace(
             go.Heatmap(
-                z=[[p00, p01], [p10, p11]],
+                z=_to_f32(actual),
                 x=["0", "1"],
                 y=["0", "1"],
                 colorscale="Blues",
@@ -546,7 +514,7 @@ def plot_measurement_correlations(results: Dict[str, int], shots: int) -> go.Fig
         
         fig.add_trace(
             go.Heatmap(
-                z=[[e00, e01], [e10, e11]],
+                z=_to_f32(expected),
                 x=["0", "1"],
                 y=["0", "1"],
                 colorscale="Greens",
@@ -557,7 +525,7 @@ def plot_measurement_correlations(results: Dict[str, int], shots: int) -> go.Fig
         
         fig.add_trace(
             go.Heatmap(
-                z=[[p00 - e00, p01 - e01], [p10 - e10, p11 - e11]],
+                z=_to_f32(actual - expected),
                 x=["0", "1"],
                 y=["0", "1"],
                 colorscale="RdBu",
@@ -586,6 +554,9 @@ def plot_measurement_correlations(results: Dict[str, int], shots: int) -> go.Fig
         return plot_measurement_results(results, shots)
 
 
+_LATEX_TABLE = str.maketrans({'|': r'\left|', '⟩': r'\right\rangle'})
+
+
 def display_quantum_state(state_str: str):
     """
     Display a quantum state in Streamlit.
@@ -596,15 +567,14 @@ def display_quantum_state(state_str: str):
     st.subheader("Quantum State")
     
     # Convert to LaTeX format
-    latex_state = state_str.replace('|', r'\left|').replace('⟩', r'\right\rangle')
+    latex_state = state_str.translate(_LATEX_TABLE)
     
     # Display using LaTeX
     st.latex(latex_state)
 
 
-def display_entanglement_explanation():
-    """Display an explanation of quantum entanglement in Streamlit."""
-    st.markdown("""
+# Static Learn-tab content, dedented once at import instead of on every rerun
+_ENTANGLEMENT_EXPLANATION = textwrap.dedent("""
     ## Quantum Entanglement
     
     Quantum entanglement is a phenomenon where two or more quantum particles become correlated in such a way that the quantum state of each particle cannot be described independently of the others, regardless of the distance separating them.
@@ -634,10 +604,7 @@ def display_entanglement_explanation():
     - Quantum computing algorithms
     """)
 
-
-def display_bell_inequality_explanation():
-    """Display an explanation of Bell's inequality in Streamlit."""
-    st.markdown("""
+_BELL_INEQUALITY_EXPLANATION = textwrap.dedent("""
     ## Bell's Inequality
     
     Bell's inequality is a mathematical constraint on the results of experiments on systems that satisfy certain locality and reality conditions. Quantum mechanics predicts that entangled particles can violate this inequality.
@@ -664,9 +631,17 @@ def display_bell_inequality_explanation():
     """)
 
 
-def set_page_style():
-    """Set the page style for the Streamlit app."""
-    st.markdown("""
+def display_entanglement_explanation():
+    """Display an explanation of quantum entanglement in Streamlit."""
+    st.markdown(_ENTANGLEMENT_EXPLANATION)
+
+
+def display_bell_inequality_explanation():
+    """Display an explanation of Bell's inequality in Streamlit."""
+    st.markdown(_BELL_INEQUALITY_EXPLANATION)
+
+
+_PAGE_STYLE = textwrap.dedent("""
     <style>
     .main {
         background-color: #f5f5f5;
@@ -686,4 +661,9 @@ def set_page_style():
         background-color: #2980b9;
     }
     </style>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """)
+
+
+def set_page_style():
+    """Set the page style for the Streamlit app."""
+    st.html(_PAGE_STYLE)
\ No newline at end of file
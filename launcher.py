@@ -12,14 +12,19 @@ It can also install required dependencies if they are missing.
 """
 
 import os
+import signal
 import subprocess
 import sys
-import importlib.util
-import pkg_resources
+from importlib.metadata import PackageNotFoundError, distribution
+
+# Streamlit's server runtime is a per-process singleton, so only the first launch can
+# run in this interpreter; later launches fall back to a subprocess.
+_streamlit_started = False
 
 def clear_screen():
     """Clear the terminal screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    # Erase the display and move the cursor home without spawning a shell
+    print("\x1b[2J\x1b[H", end="", flush=True)
 
 def print_header():
     """Print the header for the launcher."""
@@ -50,9 +55,9 @@ def check_package_installed(package_name):
         True if the package is installed, False otherwise
     """
     try:
-        pkg_resources.get_distribution(package_name)
+        distribution(package_name)
         return True
-    except pkg_resources.DistributionNotFound:
+    except PackageNotFoundError:
         return False
 
 def install_requirements(requirements_file):
@@ -71,6 +76,42 @@ def install_requirements(requirements_file):
     except subprocess.CalledProcessError:
         return False
 
+def run_streamlit_in_process(script_file):
+    """
+    Run a Streamlit app in the launcher's own interpreter.
+    
+    This skips starting a second Python process and re-importing Streamlit.
+    
+    Args:
+        script_file: Path to the script to run
+        
+    Returns:
+        True if the app was run, False if it has to be launched in a subprocess instead
+    """
+    global _streamlit_started
+    if _streamlit_started:
+        return False
+    
+    try:
+        from streamlit.web import cli as stcli
+    except ImportError:
+        return False
+    
+    _streamlit_started = True
+    argv = sys.argv
+    # Streamlit installs its own Ctrl+C handler; restore ours once it stops
+    handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+    sys.argv = ["streamlit", "run", script_file]
+    try:
+        stcli.main()
+    except (SystemExit, KeyboardInterrupt):
+        pass
+    finally:
+        sys.argv = argv
+        for sig, handler in handlers.items():
+            signal.signal(sig, handler)
+    return True
+
 def launch_project(project_dir, script_name):
     """
     Launch a project using Streamlit.
@@ -114,6 +155,10 @@ def launch_project(project_dir, script_name):
             print(f"pip install -r {requirements_file}")
             return False
     
+    # Reuse this interpreter when possible
+    if run_streamlit_in_process(script_file):
+        return True
+    
     # Build the streamlit run command using Python executable
     # This ensures streamlit is found even if it's not in the PATH
     cmd = [sys.executable, "-m", "streamlit", "run", script_file]
@@ -130,6 +175,11 @@ def launch_project(project_dir, script_name):
 
 def main():
     """Main function to run the launcher."""
+    if os.name == 'nt':
+        # Running any shell command once turns on ANSI escape handling in legacy
+        # Windows consoles, which clear_screen relies on
+        os.system('')
+    
     while True:
         clear_screen()
         print_header()
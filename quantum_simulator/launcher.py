@@ -10,8 +10,7 @@ It can also install required dependencies if they are missing.
 import os
 import subprocess
 import sys
-import importlib.util
-import pkg_resources
+from importlib.metadata import PackageNotFoundError, distribution
 
 def check_package_installed(package_name):
     """
@@ -24,9 +23,9 @@ def check_package_installed(package_name):
         True if the package is installed, False otherwise
     """
     try:
-        pkg_resources.get_distribution(package_name)
+        distribution(package_name)
         return True
-    except pkg_resources.DistributionNotFound:
+    except PackageNotFoundError:
         return False
 
 def install_requirements(requirements_file):
@@ -89,9 +88,9 @@ def main():
         cmd.extend(sys.argv[1:])
     
     try:
-        # Run the streamlit command
-        subprocess.run(cmd)
-    except Exception as e:
+        # Replace this process with streamlit instead of keeping the launcher resident as its parent
+        os.execvp(cmd[0], cmd)
+    except OSError as e:
         print(f"Error launching application: {e}")
         print(f"Command attempted: {' '.join(cmd)}")
         print("Make sure streamlit is installed correctly in your Python environment.")
@@ -7,7 +7,7 @@ It provides a user interface for creating, visualizing, and simulating quantum c
 
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+from qiskit import qasm2
 from quantum_engine import QuantumEngine
 import utils
 import os
@@ -23,6 +23,49 @@ st.set_page_config(
 # Apply custom styling
 utils.set_page_style()
 
+
+# Cached statevector, keyed on the circuit's OpenQASM text. Streamlit reruns the
+# whole script on every widget change, so an unchanged circuit is only simulated
+# once. Measurement counts are sampled afresh on every run so shot noise stays
+# visible; the engine reuses its transpiled circuit for those. The engine itself
+# is per-session mutable state and stays in st.session_state.
+@st.cache_data(max_entries=32, show_spinner=False)
+def _statevector(circuit_qasm: str, _engine: QuantumEngine):
+    return _engine.get_statevector()
+
+
+# Cached figure images. Drawing and PNG-encoding a figure costs far more than the data
+# behind it, so each is rendered once per distinct input and the bytes are reused on
+# every rerun instead of handing st.pyplot the figure again.
+@st.cache_data(max_entries=16, show_spinner=False)
+def _circuit_image(circuit_qasm: str, _engine: QuantumEngine) -> bytes:
+    return utils.figure_to_png(_engine.get_circuit_drawing(output="mpl"))
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _histogram_image(counts_key: tuple, _engine: QuantumEngine) -> bytes:
+    return utils.figure_to_png(_engine.get_histogram_figure(dict(counts_key)))
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _statevector_image(circuit_qasm: str, _engine: QuantumEngine) -> bytes:
+    return utils.figure_to_png(_engine.get_statevector_figure())
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _bloch_multivector_image(circuit_qasm: str, _engine: QuantumEngine) -> bytes:
+    return utils.figure_to_png(_engine.get_bloch_multivector_figure())
+
+# Single-qubit gate menu: label -> (engine method, name shown in messages, takes an angle)
+_SINGLE_QUBIT_GATES = {
+    "Hadamard (H)": ("add_hadamard", "Hadamard", False),
+    "Pauli-X": ("add_pauli_x", "Pauli-X", False),
+    "Pauli-Y": ("add_pauli_y", "Pauli-Y", False),
+    "Pauli-Z": ("add_pauli_z", "Pauli-Z", False),
+    "S Gate": ("add_s_gate", "S", False),
+    "T Gate": ("add_t_gate", "T", False),
+    "RX": ("add_rx", "RX", True),
+    "RY": ("add_ry", "RY", True),
+    "RZ": ("add_rz", "RZ", True),
+}
+
 def main():
     # Page header
     st.title("Quantum Circuit Simulator")
@@ -54,50 +97,27 @@ def main():
         single_qubit_col1, single_qubit_col2 = st.columns(2)
         
         with single_qubit_col1:
-            gate_type = st.selectbox(
-                "Gate Type",
-                ["Hadamard (H)", "Pauli-X", "Pauli-Y", "Pauli-Z", "S Gate", "T Gate", "RX", "RY", "RZ"]
-            )
+            gate_type = st.selectbox("Gate Type", list(_SINGLE_QUBIT_GATES))
         
         with single_qubit_col2:
             qubit_idx = st.selectbox("Qubit", range(num_qubits), format_func=lambda x: f"q{x}")
         
         # For rotation gates, add angle selection
         theta = None
-        if gate_type in ["RX", "RY", "RZ"]:
+        if _SINGLE_QUBIT_GATES[gate_type][2]:
             theta = st.slider("Rotation Angle (radians)", min_value=0.0, max_value=2*np.pi, value=np.pi/2, step=0.1)
         
         # Button to add the single-qubit gate
         if st.button("Add Single-Qubit Gate"):
             engine = st.session_state.quantum_engine
+            method, gate_name, is_rotation = _SINGLE_QUBIT_GATES[gate_type]
             
-            if gate_type == "Hadamard (H)":
-                engine.add_hadamard(qubit_idx)
-                st.success(f"Added Hadamard gate to qubit {qubit_idx}")
-            elif gate_type == "Pauli-X":
-                engine.add_pauli_x(qubit_idx)
-                st.success(f"Added Pauli-X gate to qubit {qubit_idx}")
-            elif gate_type == "Pauli-Y":
-                engine.add_pauli_y(qubit_idx)
-                st.success(f"Added Pauli-Y gate to qubit {qubit_idx}")
-            elif gate_type == "Pauli-Z":
-                engine.add_pauli_z(qubit_idx)
-                st.success(f"Added Pauli-Z gate to qubit {qubit_idx}")
-            elif gate_type == "S Gate":
-                engine.add_s_gate(qubit_idx)
-                st.success(f"Added S gate to qubit {qubit_idx}")
-            elif gate_type == "T Gate":
-                engine.add_t_gate(qubit_idx)
-                st.success(f"Added T gate to qubit {qubit_idx}")
-            elif gate_type == "RX":
-                engine.add_rx(theta, qubit_idx)
-                st.success(f"Added RX({theta:.2f}) gate to qubit {qubit_idx}")
-            elif gate_type == "RY":
-                engine.add_ry(theta, qubit_idx)
-                st.success(f"Added RY({theta:.2f}) gate to qubit {qubit_idx}")
-            elif gate_type == "RZ":
-                engine.add_rz(theta, qubit_idx)
-                st.success(f"Added RZ({theta:.2f}) gate to qubit {qubit_idx}")
+            if is_rotation:
+                getattr(engine, method)(theta, qubit_idx)
+                st.success(f"Added {gate_name}({theta:.2f}) gate to qubit {qubit_idx}")
+            else:
+                getattr(engine, method)(qubit_idx)
+                st.success(f"Added {gate_name} gate to qubit {qubit_idx}")
         
         # Multi-qubit gates
         st.subheader("Multi-Qubit Gates")
@@ -168,17 +188,25 @@ def main():
         # Simulation
         st.header("Simulation")
         shots = st.slider("Number of Shots", min_value=1, max_value=10000, value=1024)
+        statevector_only = st.checkbox("Statevector only (skip sampling)", value=False)
         
         if st.button("Run Simulation"):
             engine = st.session_state.quantum_engine
             
             with st.spinner("Running simulation..."):
-                # Get the counts from simulation
-                st.session_state.counts = engine.simulate(shots=shots)
+                circuit_qasm = qasm2.dumps(engine.circuit)
+                
+                # Get the counts from simulation; sampling is the expensive part, so it
+                # is skipped entirely when only the state is wanted
+                if statevector_only:
+                    st.session_state.counts = None
+                else:
+                    st.session_state.counts = engine.simulate(shots=shots)
+                    st.session_state.counts_shots = shots
                 
                 # Get the statevector
                 try:
-                    st.session_state.statevector = engine.get_statevector()
+                    st.session_state.statevector = _statevector(circuit_qasm, engine)
                 except Exception as e:
                     st.error(f"Error getting statevector: {e}")
                     st.session_state.statevector = None
@@ -196,7 +224,7 @@ def main():
             
             # Display circuit diagram
             try:
-                circuit_drawing = engine.get_circuit_drawing(output="mpl")
+                circuit_drawing = _circuit_image(qasm2.dumps(engine.circuit), engine)
                 utils.display_circuit(circuit_drawing)
             except Exception as e:
                 st.error(f"Error displaying circuit: {e}")
@@ -213,11 +241,12 @@ def main():
         if 'counts' in st.session_state and st.session_state.counts is not None:
             # Display histogram
             try:
-                histogram_figure = st.session_state.quantum_engine.get_histogram_figure(st.session_state.counts)
-                utils.display_histogram(histogram_figure)
+                counts_key = tuple(sorted(st.session_state.counts.items()))
+                histogram_image = _histogram_image(counts_key, st.session_state.quantum_engine)
+                utils.display_histogram(histogram_image)
                 
                 # Display probabilities table
-                utils.display_measurement_probabilities(st.session_state.counts, shots, "Measurement Probabilities")
+                utils.display_measurement_probabilities(st.session_state.counts, st.session_state.counts_shots, "Measurement Probabilities")
             except Exception as e:
                 st.error(f"Error displaying measurement results: {e}")
         else:
@@ -229,12 +258,13 @@ def main():
         if 'statevector' in st.session_state and st.session_state.statevector is not None:
             # Create columns for different representations
             col1, col2 = st.columns(2)
+            circuit_qasm = qasm2.dumps(st.session_state.quantum_engine.circuit)
             
             with col1:
                 # Display statevector visualization
                 try:
-                    statevector_figure = st.session_state.quantum_engine.get_statevector_figure()
-                    utils.display_statevector(statevector_figure)
+                    statevector_image = _statevector_image(circuit_qasm, st.session_state.quantum_engine)
+                    utils.display_statevector(statevector_image)
                 except Exception as e:
                     st.error(f"Error displaying statevector visualization: {e}")
             
@@ -242,8 +272,8 @@ def main():
                 # Display Bloch sphere for small number of qubits
                 if st.session_state.quantum_engine.num_qubits <= 5:
                     try:
-                        bloch_figure = st.session_state.quantum_engine.get_bloch_multivector_figure()
-                        utils.display_bloch_sphere(bloch_figure)
+                        bloch_image = _bloch_multivector_image(circuit_qasm, st.session_state.quantum_engine)
+                        utils.display_bloch_sphere(bloch_image)
                     except Exception as e:
                         st.error(f"Error displaying Bloch sphere: {e}")
             
@@ -6,14 +6,120 @@ It serves as the backend for the quantum circuit simulator application.
 """
 
 from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
 from qiskit_aer.backends.aer_simulator import AerSimulator
-from qiskit.visualization import plot_histogram, plot_bloch_multivector, plot_state_city
 from qiskit.quantum_info import Statevector
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Union, Any
 
 
+# The sampling backend is created once per process and shared by every engine
+_AER_SIM = AerSimulator()
+
+# Transpiled circuits keyed on (circuit structure, backend name), oldest evicted first
+_TRANSPILE_CACHE_SIZE = 64
+_transpile_cache: Dict[Tuple[tuple, str], QuantumCircuit] = {}
+
+
+def _circuit_key(circuit: QuantumCircuit) -> tuple:
+    """
+    Build a hashable structural key for a circuit.
+    
+    Args:
+        circuit: Quantum circuit to describe
+        
+    Returns:
+        Tuple of (gate name, parameters, qubits, clbits) for every instruction,
+        followed by the register sizes
+    """
+    instructions = tuple(
+        (
+            inst.operation.name,
+            tuple(p.tobytes() if isinstance(p, np.ndarray) else p for p in inst.operation.params),
+            tuple(circuit.find_bit(q).index for q in inst.qubits),
+            tuple(circuit.find_bit(c).index for c in inst.clbits),
+        )
+        for inst in circuit.data
+    )
+    return instructions + (circuit.num_qubits, circuit.num_clbits)
+
+
+def _transpile_cached(circuit: QuantumCircuit, backend) -> QuantumCircuit:
+    """
+    Transpile a circuit for a backend, reusing earlier results for identical circuits.
+    
+    Circuits built from the simulator's gate menu only use instructions Aer runs
+    natively, so they are returned as-is; anything else is transpiled without
+    optimization passes, which would cost more than they save on these small circuits.
+    
+    Args:
+        circuit: Quantum circuit to transpile
+        backend: Target backend
+        
+    Returns:
+        Transpiled circuit
+    """
+    native = backend.target.operation_names
+    if all(inst.operation.name in native or inst.operation.name == 'barrier' for inst in circuit.data):
+        return circuit
+    
+    key = (_circuit_key(circuit), backend.name)
+    if key not in _transpile_cache:
+        if len(_transpile_cache) >= _TRANSPILE_CACHE_SIZE:
+            del _transpile_cache[next(iter(_transpile_cache))]
+        _transpile_cache[key] = transpile(circuit, backend, optimization_level=0)
+    return _transpile_cache[key]
+
+
+# Histograms with at most this many outcomes (5 measured qubits) skip plot_histogram
+_FAST_HISTOGRAM_MAX_OUTCOMES = 32
+
+# Basis-state labels for the circuit sizes the UI offers (up to 5 qubits)
+_BASIS_TABLE = {n: tuple(np.binary_repr(i, width=n) for i in range(2 ** n)) for n in range(1, 6)}
+
+
+def _format_amplitude(amplitude: complex) -> str:
+    """
+    Format a complex amplitude for the bra-ket notation.
+    
+    Args:
+        amplitude: Complex amplitude
+        
+    Returns:
+        Real or imaginary part alone if the other is zero, otherwise "(a+bj)"
+    """
+    if amplitude.real != 0 and amplitude.imag != 0:
+        return f"({amplitude.real:.4f}{'+' if amplitude.imag > 0 else ''}{amplitude.imag:.4f}j)"
+    elif amplitude.real != 0:
+        return f"{amplitude.real:.4f}"
+    return f"{amplitude.imag:.4f}j"
+
+
+def _fast_histogram(counts: Dict[str, int]):
+    """
+    Draw measurement counts as a plain bar chart.
+    
+    Args:
+        counts: Dictionary mapping measurement outcomes to their counts
+        
+    Returns:
+        Matplotlib figure object
+    """
+    # Imported on first use, like the Qiskit plotting helpers
+    import matplotlib.pyplot as plt
+    
+    keys = sorted(counts)
+    fig, ax = plt.subplots(figsize=(7, 5))
+    fig.subplots_adjust(bottom=0.3)
+    bars = ax.bar(keys, [counts[k] for k in keys], color='#648fff')
+    ax.bar_label(bars)
+    ax.set_xlabel('State')
+    ax.set_ylabel('Counts')
+    ax.tick_params(axis='x', labelrotation=70, labelsize=8)
+    # Detach from pyplot's figure registry; the caller displays and caches the figure
+    plt.close(fig)
+    return fig
+
+
 class QuantumEngine:
     """
     A class to handle quantum circuit operations using Qiskit.
@@ -29,8 +135,17 @@ class QuantumEngine:
         """
         self.num_qubits = num_qubits
         self.num_bits = num_bits
-        self.circuit = QuantumCircuit(num_qubits, num_bits)
-        self.simulator = Aer.get_backend('aer_simulator')
+        self.simulator = _AER_SIM
+        # Gates as (QuantumCircuit method, arguments) tuples; the circuit itself is
+        # only materialized when something reads it
+        self._ops: List[Tuple[str, tuple]] = []
+        # Set by measure_all/measure_qubit so simulate() needs no scan of the circuit
+        self._has_measurements = False
+        # Built circuit, last statevector and the circuit handed to the sampler, each
+        # keyed on the gate list they were derived from
+        self._circuit_cache: Optional[Tuple[tuple, QuantumCircuit]] = None
+        self._sv_cache: Optional[Tuple[tuple, Any]] = None
+        self._run_cache: Optional[Tuple[tuple, QuantumCircuit]] = None
         
     def reset_circuit(self, num_qubits: Optional[int] = None, num_bits: Optional[int] = None):
         """
@@ -42,79 +157,108 @@ class QuantumEngine:
         """
         self.num_qubits = num_qubits if num_qubits is not None else self.num_qubits
         self.num_bits = num_bits if num_bits is not None else self.num_bits
-        self.circuit = QuantumCircuit(self.num_qubits, self.num_bits)
+        self._ops = []
+        self._has_measurements = False
+        self._circuit_cache = None
+        self._sv_cache = None
+        self._run_cache = None
+    
+    @property
+    def circuit(self) -> QuantumCircuit:
+        """Quantum circuit for the gates added so far, rebuilt only after a change."""
+        key = tuple(self._ops)
+        if self._circuit_cache is None or self._circuit_cache[0] != key:
+            self._circuit_cache = (key, self._build_circuit())
+        return self._circuit_cache[1]
+    
+    def _build_circuit(self, skip: Tuple[str, ...] = ()) -> QuantumCircuit:
+        """
+        Materialize the gate list as a Qiskit circuit.
+        
+        Args:
+            skip: Operation names to leave out
+            
+        Returns:
+            New QuantumCircuit with the recorded operations applied in order
+        """
+        circuit = QuantumCircuit(self.num_qubits, self.num_bits)
+        for name, args in self._ops:
+            if name not in skip:
+                getattr(circuit, name)(*args)
+        return circuit
     
     # Single-qubit gates
     def add_hadamard(self, qubit: int):
         """Add Hadamard gate to the specified qubit."""
-        self.circuit.h(qubit)
+        self._ops.append(('h', (qubit,)))
         return self
     
     def add_pauli_x(self, qubit: int):
         """Add Pauli-X (NOT) gate to the specified qubit."""
-        self.circuit.x(qubit)
+        self._ops.append(('x', (qubit,)))
         return self
     
     def add_pauli_y(self, qubit: int):
         """Add Pauli-Y gate to the specified qubit."""
-        self.circuit.y(qubit)
+        self._ops.append(('y', (qubit,)))
         return self
     
     def add_pauli_z(self, qubit: int):
         """Add Pauli-Z gate to the specified qubit."""
-        self.circuit.z(qubit)
+        self._ops.append(('z', (qubit,)))
         return self
     
     def add_s_gate(self, qubit: int):
         """Add S gate (phase gate) to the specified qubit."""
-        self.circuit.s(qubit)
+        self._ops.append(('s', (qubit,)))
         return self
     
     def add_t_gate(self, qubit: int):
         """Add T gate to the specified qubit."""
-        self.circuit.t(qubit)
+        self._ops.append(('t', (qubit,)))
         return self
     
     def add_rx(self, theta: float, qubit: int):
         """Add rotation around X-axis to the specified qubit."""
-        self.circuit.rx(theta, qubit)
+        self._ops.append(('rx', (theta, qubit)))
         return self
     
     def add_ry(self, theta: float, qubit: int):
         """Add rotation around Y-axis to the specified qubit."""
-        self.circuit.ry(theta, qubit)
+        self._ops.append(('ry', (theta, qubit)))
         return self
     
     def add_rz(self, theta: float, qubit: int):
         """Add rotation around Z-axis to the specified qubit."""
-        self.circuit.rz(theta, qubit)
+        self._ops.append(('rz', (theta, qubit)))
         return self
     
     # Multi-qubit gates
     def add_cnot(self, control: int, target: int):
         """Add CNOT (Controlled-X) gate with the specified control and target qubits."""
-        self.circuit.cx(control, target)
+        self._ops.append(('cx', (control, target)))
         return self
     
     def add_cz(self, control: int, target: int):
         """Add Controlled-Z gate with the specified control and target qubits."""
-        self.circuit.cz(control, target)
+        self._ops.append(('cz', (control, target)))
         return self
     
     def add_swap(self, qubit1: int, qubit2: int):
         """Add SWAP gate between the specified qubits."""
-        self.circuit.swap(qubit1, qubit2)
+        self._ops.append(('swap', (qubit1, qubit2)))
         return self
     
     def add_toffoli(self, control1: int, control2: int, target: int):
         """Add Toffoli (CCNOT) gate with the specified control and target qubits."""
-        self.circuit.ccx(control1, control2, target)
+        self._ops.append(('ccx', (control1, control2, target)))
         return self
     
     # Measurement
     def measure_all(self):
         """Add measurement to all qubits."""
-        self.circuit.measure_all()
+        self._ops.append(('measure_all', ()))
+        self._has_measurements = True
         return self
     
     def measure_qubit(self, qubit: int, bit: int):
@@ -125,7 +269,8 @@ class QuantumEngine:
             qubit: Index of the qubit to measure
             bit: Index of the classical bit to store the result
         """
-        self.circuit.measure(qubit, bit)
+        self._ops.append(('measure', (qubit, bit)))
+        self._has_measurements = True
         return self
     
     # Simulation
@@ -139,52 +284,47 @@ class QuantumEngine:
         Returns:
             Dictionary mapping measurement outcomes to their counts
         """
-        # Check if the circuit has any measurements
-        has_measurements = False
-        for instruction in self.circuit.data:
-            if instruction.operation.name == 'measure':
-                has_measurements = True
-                break
-        
-        # If no measurements, add measurements to all qubits
-        if not has_measurements:
-            # Create a copy of the circuit to avoid modifying the original
-            circuit_copy = self.circuit.copy()
-            circuit_copy.measure_all()
-            transpiled_circuit = transpile(circuit_copy, self.simulator)
+        # Reruns with different shot counts reuse the prepared circuit until a gate is added
+        key = tuple(self._ops)
+        if self._run_cache is not None and self._run_cache[0] == key:
+            transpiled_circuit = self._run_cache[1]
         else:
-            transpiled_circuit = transpile(self.circuit, self.simulator)
+            # If no measurements, add measurements to all qubits
+            if not self._has_measurements:
+                # Replay the gate list into a fresh circuit instead of copying the
+                # cached one, so the original is left untouched
+                circuit_copy = self._build_circuit()
+                circuit_copy.measure_all()
+                transpiled_circuit = _transpile_cached(circuit_copy, self.simulator)
+            else:
+                transpiled_circuit = _transpile_cached(self.circuit, self.simulator)
+            self._run_cache = (key, transpiled_circuit)
         
         job = self.simulator.run(transpiled_circuit, shots=shots)
         result = job.result()
         counts = result.get_counts()
         return counts
     
-    def get_statevector(self) -> np.ndarray:
+    def get_statevector(self) -> Statevector:
         """
         Get the statevector representation of the quantum state.
         
         Returns:
-            NumPy array representing the quantum state vector
+            Statevector of the circuit with its measurements removed
         """
-        # Create a new simulator that returns the statevector
-        statevector_sim = Aer.get_backend('statevector_simulator')
+        # The figures and bra-ket notation all ask for the same state; reuse it
+        key = tuple(self._ops)
+        if self._sv_cache is not None and self._sv_cache[0] == key:
+            return self._sv_cache[1]
         
-        # Create a copy of the circuit without measurements to get the statevector
-        circuit_copy = self.circuit.copy()
+        # Build the circuit without its measurements straight from the gate list
+        circuit_copy = self.circuit
+        if self._has_measurements:
+            circuit_copy = self._build_circuit(skip=('measure', 'measure_all'))
         
-        # Remove any measurements from the circuit copy
-        # This is a simplistic approach; in a real application, you might want to
-        # create a new circuit with just the gates
-        for instruction in circuit_copy.data:
-            if instruction.operation.name == 'measure':
-                circuit_copy.data.remove(instruction)
-        
-        # Execute the circuit
-        transpiled_circuit = transpile(circuit_copy, statevector_sim)
-        job = statevector_sim.run(transpiled_circuit)
-        result = job.result()
-        statevector = result.get_statevector()
+        # Simulate the circuit directly; no backend job is needed for a statevector
+        statevector = Statevector.from_instruction(circuit_copy)
+        self._sv_cache = (key, statevector)
         
         return statevector
     
@@ -198,12 +338,19 @@ class QuantumEngine:
         Returns:
             Tuple (x, y, z) representing the Bloch vector
         """
-        # This is a simplified implementation
-        # In a real application, you would extract the Bloch vector from the density matrix
-        statevector = self.get_statevector()
-        state = Statevector(statevector)
-        bloch = state.expectation_value([("X", [qubit]), ("Y", [qubit]), ("Z", [qubit])])
-        return (bloch[0].real, bloch[1].real, bloch[2].real)
+        # Reuse the cached statevector and read the vector off the qubit's reduced
+        # density matrix, rather than simulating once per expectation value
+        psi = np.asarray(self.get_statevector()).reshape((2,) * self.num_qubits)
+        
+        # Axis 0 is the most significant (highest) qubit; tracing out the rest
+        # leaves rho = A A^dagger for the qubit's 2 x 2^(n-1) slice A
+        amplitudes = np.moveaxis(psi, self.num_qubits - 1 - qubit, 0).reshape(2, -1)
+        rho = amplitudes @ amplitudes.conj().T
+        
+        x = 2 * rho[0, 1].real
+        y = 2 * rho[1, 0].imag
+        z = (rho[0, 0] - rho[1, 1]).real
+        return (float(x), float(y), float(z))
     
     # Visualization helpers (these will be used by utils.py)
     def get_circuit_drawing(self, output: str = "text") -> Any:
@@ -228,6 +375,12 @@ class QuantumEngine:
         Returns:
             Matplotlib figure object
         """
+        # The UI's circuits stay small enough for a direct bar chart
+        if len(counts) <= _FAST_HISTOGRAM_MAX_OUTCOMES:
+            return _fast_histogram(counts)
+        
+        # Imported on first use: qiskit.visualization pulls in matplotlib
+        from qiskit.visualization import plot_histogram
         return plot_histogram(counts)
     
     def get_statevector_figure(self):
@@ -237,6 +390,7 @@ class QuantumEngine:
         Returns:
             Matplotlib figure object
         """
+        from qiskit.visualization import plot_state_city
         statevector = self.get_statevector()
         return plot_state_city(statevector)
     
@@ -247,6 +401,7 @@ class QuantumEngine:
         Returns:
             Matplotlib figure object
         """
+        from qiskit.visualization import plot_bloch_multivector
         statevector = self.get_statevector()
         return plot_bloch_multivector(statevector)
     
@@ -257,35 +412,24 @@ class QuantumEngine:
         Returns:
             String representation of the quantum state in bra-ket notation
         """
-        statevector = self.get_statevector()
-        
-        # Format the statevector as a bra-ket string
-        n_qubits = int(np.log2(len(statevector)))
-        bra_ket = ""
+        statevector = np.asarray(self.get_statevector())
+        n_qubits = self.num_qubits
         
         # Threshold for considering an amplitude as zero
         threshold = 1e-10
         
-        for i, amplitude in enumerate(statevector):
-            if abs(amplitude) > threshold:
-                # Convert index to binary representation (the basis state)
-                basis_state = format(i, f'0{n_qubits}b')
-                
-                # Format the complex amplitude
-                if amplitude.real == 0 and amplitude.imag == 0:
-                    continue
-                
-                term = ""
-                if amplitude.real != 0 and amplitude.imag != 0:
-                    term = f"({amplitude.real:.4f}{'+' if amplitude.imag > 0 else ''}{amplitude.imag:.4f}j)"
-                elif amplitude.real != 0:
-                    term = f"{amplitude.real:.4f}"
-                else:
-                    term = f"{amplitude.imag:.4f}j"
-                
-                if bra_ket:
-                    bra_ket += " + "
-                
-                bra_ket += f"{term}|{basis_state}⟩"
+        # Mask the non-negligible amplitudes in one vectorized pass, then only
+        # format those (the state is usually sparse in the computational basis).
+        # Comparing squared magnitudes skips the square root in np.abs.
+        magnitudes = statevector.real ** 2 + statevector.imag ** 2
+        indices = np.flatnonzero(magnitudes > threshold * threshold)
+        if n_qubits in _BASIS_TABLE:
+            labels = [_BASIS_TABLE[n_qubits][i] for i in indices]
+        else:
+            labels = [np.binary_repr(i, width=n_qubits) for i in indices]
+        terms = [
+            f"{_format_amplitude(statevector[i])}|{label}⟩"
+            for i, label in zip(indices, labels)
+        ]
         
-        return bra_ket
\ No newline at end of file
+        return " + ".join(terms)
\ No newline at end of file
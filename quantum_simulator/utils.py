@@ -9,23 +9,181 @@ import streamlit as st
 import matplotlib.pyplot as plt
 import numpy as np
 from io import BytesIO
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Union, Any
 import base64
+import textwrap
+from functools import lru_cache
 from PIL import Image
 
+# Gate reference tables, keyed on lowercase gate name
+_GATE_DESCRIPTIONS = {
+    "h": "Hadamard gate - Creates superposition by putting a qubit in an equal superposition of |0⟩ and |1⟩.",
+    "x": "Pauli-X gate - Quantum equivalent of the NOT gate, flips the state of a qubit.",
+    "y": "Pauli-Y gate - Rotates the qubit state around the Y-axis of the Bloch sphere.",
+    "z": "Pauli-Z gate - Rotates the qubit state around the Z-axis of the Bloch sphere.",
+    "s": "S gate - Phase gate that rotates the qubit state by 90 degrees around the Z-axis.",
+    "t": "T gate - Phase gate that rotates the qubit state by 45 degrees around the Z-axis.",
+    "rx": "RX gate - Rotation around the X-axis of the Bloch sphere by a specified angle.",
+    "ry": "RY gate - Rotation around the Y-axis of the Bloch sphere by a specified angle.",
+    "rz": "RZ gate - Rotation around the Z-axis of the Bloch sphere by a specified angle.",
+    "cx": "CNOT gate - Controlled-X gate that flips the target qubit if the control qubit is |1⟩.",
+    "cz": "CZ gate - Controlled-Z gate that applies a Z gate to the target qubit if the control qubit is |1⟩.",
+    "swap": "SWAP gate - Exchanges the states of two qubits.",
+    "ccx": "Toffoli gate - Controlled-Controlled-X gate, flips the target qubit if both control qubits are |1⟩."
+}
+
+_GATE_MATRICES = {
+    "h": r"\frac{1}{\sqrt{2}} \begin{pmatrix} 1 & 1 \\ 1 & -1 \end{pmatrix}",
+    "x": r"\begin{pmatrix} 0 & 1 \\ 1 & 0 \end{pmatrix}",
+    "y": r"\begin{pmatrix} 0 & -i \\ i & 0 \end{pmatrix}",
+    "z": r"\begin{pmatrix} 1 & 0 \\ 0 & -1 \end{pmatrix}",
+    "s": r"\begin{pmatrix} 1 & 0 \\ 0 & i \end{pmatrix}",
+    "t": r"\begin{pmatrix} 1 & 0 \\ 0 & e^{i\pi/4} \end{pmatrix}",
+    "rx": r"\begin{pmatrix} \cos(\theta/2) & -i\sin(\theta/2) \\ -i\sin(\theta/2) & \cos(\theta/2) \end{pmatrix}",
+    "ry": r"\begin{pmatrix} \cos(\theta/2) & -\sin(\theta/2) \\ \sin(\theta/2) & \cos(\theta/2) \end{pmatrix}",
+    "rz": r"\begin{pmatrix} e^{-i\theta/2} & 0 \\ 0 & e^{i\theta/2} \end{pmatrix}",
+}
+
+# Gates with a matrix in the table above
+_SINGLE_QUBIT_GATES = frozenset(_GATE_MATRICES)
+
+# Translation table for rendering |x⟩ kets with st.latex
+_BRA_KET_LATEX = str.maketrans({'|': r'\left|', '⟩': r'\right\rangle'})
+
+# Measurement tables with more rows than this use st.dataframe instead of st.table
+_STATIC_TABLE_MAX_ROWS = 16
+
+# Custom CSS for the simulator page
+_PAGE_STYLE = textwrap.dedent("""
+    <style>
+    .main {
+        background-color: #f5f5f5;
+    }
+    .stApp {
+        max-width: 1200px;
+        margin: 0 auto;
+    }
+    h1, h2, h3 {
+        color: #2c3e50;
+    }
+    .stButton button {
+        background-color: #3498db;
+        color: white;
+    }
+    .stButton button:hover {
+        background-color: #2980b9;
+    }
+    </style>
+    """)
+
+# Markdown explanations shown by display_quantum_concept
+_CONCEPT_MD = {
+    "superposition": """
+    ## Superposition
+    
+    Superposition is a fundamental principle of quantum mechanics where quantum systems can exist in multiple states simultaneously.
+    
+    In classical computing, a bit can be either 0 or 1. In quantum computing, a qubit can exist in a superposition of both 0 and 1 states.
+    
+    Mathematically, a qubit in superposition is represented as:
+    
+    $|\psi\\rangle = \\alpha|0\\rangle + \\beta|1\\rangle$
+    
+    where $\\alpha$ and $\\beta$ are complex numbers such that $|\\alpha|^2 + |\\beta|^2 = 1$.
+    
+    The Hadamard gate (H) is commonly used to create superposition from the $|0\\rangle$ state:
+    
+    $H|0\\rangle = \\frac{1}{\\sqrt{2}}(|0\\rangle + |1\\rangle)$
+    """,
+    
+    "entanglement": """
+    ## Entanglement
+    
+    Entanglement is a quantum phenomenon where two or more qubits become correlated in such a way that the quantum state of each qubit cannot be described independently of the others.
+    
+    When qubits are entangled, measuring one qubit instantly affects the state of the other, regardless of the distance between them.
+    
+    The Bell states are the simplest examples of entangled states:
+    
+    $|\\Phi^+\\rangle = \\frac{1}{\\sqrt{2}}(|00\\rangle + |11\\rangle)$
+    
+    $|\\Phi^-\\rangle = \\frac{1}{\\sqrt{2}}(|00\\rangle - |11\\rangle)$
+    
+    $|\\Psi^+\\rangle = \\frac{1}{\\sqrt{2}}(|01\\rangle + |10\\rangle)$
+    
+    $|\\Psi^-\\rangle = \\frac{1}{\\sqrt{2}}(|01\\rangle - |10\\rangle)$
+    
+    To create an entangled state, we typically apply a Hadamard gate to one qubit and then a CNOT gate with that qubit as the control.
+    """,
+    
+    "measurement": """
+    ## Quantum Measurement
+    
+    Measurement in quantum computing causes the quantum state to collapse to one of its basis states.
+    
+    When we measure a qubit in superposition, we get either 0 or 1 with probabilities determined by the amplitudes of the quantum state.
+    
+    For a qubit in state $|\\psi\\rangle = \\alpha|0\\rangle + \\beta|1\\rangle$:
+    - The probability of measuring 0 is $|\\alpha|^2$
+    - The probability of measuring 1 is $|\\beta|^2$
+    
+    After measurement, the qubit's state collapses to the measured value, losing its superposition.
+    
+    This probabilistic nature of quantum measurement is a key difference from classical computing.
+    """,
+    
+    "interference": """
+    ## Quantum Interference
+    
+    Quantum interference is a phenomenon where the amplitudes of quantum states can combine constructively or destructively, affecting the probabilities of measurement outcomes.
+    
+    It's similar to wave interference in physics, where waves can reinforce or cancel each other out.
+    
+    In quantum algorithms, interference is deliberately used to amplify correct answers and suppress incorrect ones.
+    
+    For example, in the Deutsch-Jozsa algorithm, interference allows us to determine if a function is constant or balanced with just one query, which would be impossible classically.
+    
+    The Hadamard gate is often used to create interference by putting qubits in superposition and then allowing them to interfere with each other.
+    """
+}
+
+
+def figure_to_png(fig: plt.Figure) -> bytes:
+    """
+    Render a matplotlib figure to PNG bytes and release it.
+    
+    Args:
+        fig: Figure to render
+        
+    Returns:
+        PNG image, rendered with the same settings st.pyplot uses
+    """
+    buffer = BytesIO()
+    fig.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+def _show_figure(figure: Union[plt.Figure, bytes]):
+    # Pre-rendered PNG bytes skip matplotlib entirely
+    if isinstance(figure, bytes):
+        st.image(figure, width="stretch")
+    else:
+        st.pyplot(figure)
+
 def display_circuit(circuit_drawing: Any, title: str = "Quantum Circuit"):
     """
     Display a quantum circuit diagram in Streamlit.
     
     Args:
-        circuit_drawing: Circuit drawing from QuantumEngine.get_circuit_drawing()
+        circuit_drawing: Circuit drawing from QuantumEngine.get_circuit_drawing(), or
+            the PNG bytes of an 'mpl' drawing from figure_to_png()
         title: Title to display above the circuit
     """
     st.subheader(title)
     
-    # If the circuit drawing is a matplotlib figure
-    if isinstance(circuit_drawing, plt.Figure):
-        st.pyplot(circuit_drawing)
+    # If the circuit drawing is a matplotlib figure, or one already rendered to PNG
+    if isinstance(circuit_drawing, (plt.Figure, bytes)):
+        _show_figure(circuit_drawing)
     # If it's a text representation
     elif isinstance(circuit_drawing, str):
         st.text(circuit_drawing)
@@ -33,38 +191,41 @@ def display_circuit(circuit_drawing: Any, title: str = "Quantum Circuit"):
     else:
         st.warning("Unsupported circuit drawing format")
 
-def display_histogram(histogram_figure: plt.Figure, title: str = "Measurement Results"):
+def display_histogram(histogram_figure: Union[plt.Figure, bytes], title: str = "Measurement Results"):
     """
     Display a histogram of measurement results in Streamlit.
     
     Args:
-        histogram_figure: Histogram figure from QuantumEngine.get_histogram_figure()
+        histogram_figure: Histogram figure from QuantumEngine.get_histogram_figure(),
+            or its PNG bytes from figure_to_png()
         title: Title to display above the histogram
     """
     st.subheader(title)
-    st.pyplot(histogram_figure)
+    _show_figure(histogram_figure)
 
-def display_statevector(statevector_figure: plt.Figure, title: str = "Quantum State Visualization"):
+def display_statevector(statevector_figure: Union[plt.Figure, bytes], title: str = "Quantum State Visualization"):
     """
     Display a visualization of the statevector in Streamlit.
     
     Args:
-        statevector_figure: Statevector figure from QuantumEngine.get_statevector_figure()
+        statevector_figure: Statevector figure from QuantumEngine.get_statevector_figure(),
+            or its PNG bytes from figure_to_png()
         title: Title to display above the visualization
     """
     st.subheader(title)
-    st.pyplot(statevector_figure)
+    _show_figure(statevector_figure)
 
-def display_bloch_sphere(bloch_figure: plt.Figure, title: str = "Bloch Sphere Representation"):
+def display_bloch_sphere(bloch_figure: Union[plt.Figure, bytes], title: str = "Bloch Sphere Representation"):
     """
     Display a Bloch sphere representation in Streamlit.
     
     Args:
-        bloch_figure: Bloch sphere figure from QuantumEngine.get_bloch_multivector_figure()
+        bloch_figure: Bloch sphere figure from QuantumEngine.get_bloch_multivector_figure(),
+            or its PNG bytes from figure_to_png()
         title: Title to display above the Bloch sphere
     """
     st.subheader(title)
-    st.pyplot(bloch_figure)
+    _show_figure(bloch_figure)
 
 def display_bra_ket_notation(bra_ket: str, title: str = "Quantum State (Bra-Ket Notation)"):
     """
@@ -75,7 +236,7 @@ def display_bra_ket_notation(bra_ket: str, title: str = "Quantum State (Bra-Ket
         title: Title to display above the notation
     """
     st.subheader(title)
-    st.latex(bra_ket.replace('|', r'\left|').replace('⟩', r'\right\rangle'))
+    st.latex(bra_ket.translate(_BRA_KET_LATEX))
 
 def display_statevector_as_vector(statevector: np.ndarray, title: str = "Quantum State (Vector Representation)"):
     """
@@ -87,20 +248,10 @@ def display_statevector_as_vector(statevector: np.ndarray, title: str = "Quantum
     """
     st.subheader(title)
     
-    # Format the statevector as a column vector for LaTeX
-    latex_vector = r"\begin{pmatrix}"
-    for amplitude in statevector:
-        # Format the complex number
-        if amplitude.real == 0 and amplitude.imag == 0:
-            latex_vector += "0 \\\\"
-        elif amplitude.real == 0:
-            latex_vector += f"{amplitude.imag:.4f}j \\\\"
-        elif amplitude.imag == 0:
-            latex_vector += f"{amplitude.real:.4f} \\\\"
-        else:
-            latex_vector += f"{amplitude.real:.4f}{'+' if amplitude.imag > 0 else ''}{amplitude.imag:.4f}j \\\\"
-    
-    latex_vector += r"\end{pmatrix}"
+    # Format the statevector as a column vector for LaTeX; tolist() yields plain
+    # Python complex numbers, and the rows are joined once instead of appended
+    rows = [format_complex_number(amplitude) for amplitude in np.asarray(statevector).tolist()]
+    latex_vector = r"\begin{pmatrix}" + r" \\ ".join(rows) + r"\end{pmatrix}"
     
     st.latex(latex_vector)
 
@@ -115,20 +266,40 @@ def display_measurement_probabilities(counts: Dict[str, int], shots: int, title:
     """
     st.subheader(title)
     
-    # Calculate probabilities
-    probabilities = {state: count / shots for state, count in counts.items()}
-    
-    # Sort by state
-    sorted_probs = sorted(probabilities.items(), key=lambda x: x[0])
+    # Pull the outcomes and counts into parallel arrays in one pass, then sort and
+    # normalize them together
+    states = np.array(list(counts.keys()))
+    count_values = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    order = np.argsort(states)
+    states, count_values = states[order], count_values[order]
+    probabilities = count_values / shots
     
     # Display as a table
-    data = {"State": [], "Probability": [], "Count": []}
-    for state, prob in sorted_probs:
-        data["State"].append(state)
-        data["Probability"].append(f"{prob:.4f}")
-        data["Count"].append(counts[state])
+    data = {
+        "State": states.tolist(),
+        "Probability": np.char.mod("%.4f", probabilities).tolist(),
+        "Count": count_values.tolist(),
+    }
     
-    st.table(data)
+    # Small tables read best as static HTML; larger ones go through Arrow and a
+    # virtualized, scrollable grid
+    if len(counts) > _STATIC_TABLE_MAX_ROWS:
+        st.dataframe(data, hide_index=True, width="stretch")
+    else:
+        st.table(data)
+
+@lru_cache(maxsize=4096)
+def _format_rounded_complex(real: float, imag: float) -> str:
+    # Statevectors repeat a handful of amplitudes (0, 1, 1/sqrt(2), ...), so the
+    # formatted strings are cached on the rounded parts
+    if real == 0 and imag == 0:
+        return "0"
+    elif real == 0:
+        return f"{imag:.4f}j"
+    elif imag == 0:
+        return f"{real:.4f}"
+    else:
+        return f"{real:.4f}{'+' if imag > 0 else ''}{imag:.4f}j"
 
 def format_complex_number(z: complex) -> str:
     """
@@ -140,14 +311,8 @@ def format_complex_number(z: complex) -> str:
     Returns:
         Formatted string representation
     """
-    if z.real == 0 and z.imag == 0:
-        return "0"
-    elif z.real == 0:
-        return f"{z.imag:.4f}j"
-    elif z.imag == 0:
-        return f"{z.real:.4f}"
-    else:
-        return f"{z.real:.4f}{'+' if z.imag > 0 else ''}{z.imag:.4f}j"
+    # Rounding to the displayed precision first also shows parts below it as 0
+    return _format_rounded_complex(round(z.real, 4), round(z.imag, 4))
 
 def get_gate_description(gate_name: str) -> str:
     """
@@ -159,23 +324,7 @@ def get_gate_description(gate_name: str) -> str:
     Returns:
         Description of the gate
     """
-    descriptions = {
-        "h": "Hadamard gate - Creates superposition by putting a qubit in an equal superposition of |0⟩ and |1⟩.",
-        "x": "Pauli-X gate - Quantum equivalent of the NOT gate, flips the state of a qubit.",
-        "y": "Pauli-Y gate - Rotates the qubit state around the Y-axis of the Bloch sphere.",
-        "z": "Pauli-Z gate - Rotates the qubit state around the Z-axis of the Bloch sphere.",
-        "s": "S gate - Phase gate that rotates the qubit state by 90 degrees around the Z-axis.",
-        "t": "T gate - Phase gate that rotates the qubit state by 45 degrees around the Z-axis.",
-        "rx": "RX gate - Rotation around the X-axis of the Bloch sphere by a specified angle.",
-        "ry": "RY gate - Rotation around the Y-axis of the Bloch sphere by a specified angle.",
-        "rz": "RZ gate - Rotation around the Z-axis of the Bloch sphere by a specified angle.",
-        "cx": "CNOT gate - Controlled-X gate that flips the target qubit if the control qubit is |1⟩.",
-        "cz": "CZ gate - Controlled-Z gate that applies a Z gate to the target qubit if the control qubit is |1⟩.",
-        "swap": "SWAP gate - Exchanges the states of two qubits.",
-        "ccx": "Toffoli gate - Controlled-Controlled-X gate, flips the target qubit if both control qubits are |1⟩."
-    }
-    
-    return descriptions.get(gate_name.lower(), "No description available for this gate.")
+    return _GATE_DESCRIPTIONS.get(gate_name.lower(), "No description available for this gate.")
 
 def get_gate_matrix(gate_name: str) -> str:
     """
@@ -187,19 +336,7 @@ def get_gate_matrix(gate_name: str) -> str:
     Returns:
         LaTeX string representing the gate matrix
     """
-    matrices = {
-        "h": r"\frac{1}{\sqrt{2}} \begin{pmatrix} 1 & 1 \\ 1 & -1 \end{pmatrix}",
-        "x": r"\begin{pmatrix} 0 & 1 \\ 1 & 0 \end{pmatrix}",
-        "y": r"\begin{pmatrix} 0 & -i \\ i & 0 \end{pmatrix}",
-        "z": r"\begin{pmatrix} 1 & 0 \\ 0 & -1 \end{pmatrix}",
-        "s": r"\begin{pmatrix} 1 & 0 \\ 0 & i \end{pmatrix}",
-        "t": r"\begin{pmatrix} 1 & 0 \\ 0 & e^{i\pi/4} \end{pmatrix}",
-        "rx": r"\begin{pmatrix} \cos(\theta/2) & -i\sin(\theta/2) \\ -i\sin(\theta/2) & \cos(\theta/2) \end{pmatrix}",
-        "ry": r"\begin{pmatrix} \cos(\theta/2) & -\sin(\theta/2) \\ \sin(\theta/2) & \cos(\theta/2) \end{pmatrix}",
-        "rz": r"\begin{pmatrix} e^{-i\theta/2} & 0 \\ 0 & e^{i\theta/2} \end{pmatrix}",
-    }
-    
-    return matrices.get(gate_name.lower(), "Matrix representation not available.")
+    return _GATE_MATRICES.get(gate_name.lower(), "Matrix representation not available.")
 
 def display_gate_info(gate_name: str):
     """
@@ -215,11 +352,24 @@ def display_gate_info(gate_name: str):
     st.write(description)
     
     # Display matrix representation for single-qubit gates
-    if gate_name.lower() in ["h", "x", "y", "z", "s", "t", "rx", "ry", "rz"]:
+    if gate_name.lower() in _SINGLE_QUBIT_GATES:
         st.subheader("Matrix Representation")
         matrix = get_gate_matrix(gate_name)
         st.latex(matrix)
 
+# Static assets are read from disk once per process. Failures raise out of the
+# cached readers, so they are never cached and the next rerun tries again.
+@st.cache_resource(show_spinner=False)
+def _read_image(image_path: str):
+    # copy() loads the pixels and detaches the cached image from its file handle
+    with Image.open(image_path) as image:
+        return image.copy()
+
+@st.cache_data(show_spinner=False)
+def _read_image_base64(image_path: str) -> str:
+    with open(image_path, "rb") as img_file:
+        return base64.b64encode(img_file.read()).decode()
+
 def load_image(image_path: str):
     """
     Load an image from a file path.
@@ -231,7 +381,7 @@ def load_image(image_path: str):
         PIL Image object
     """
     try:
-        return Image.open(image_path)
+        return _read_image(image_path)
     except Exception as e:
         st.error(f"Error loading image: {e}")
         return None
@@ -247,8 +397,7 @@ def get_image_base64(image_path: str) -> Optional[str]:
         Base64 encoded string of the image
     """
     try:
-        with open(image_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode()
+        return _read_image_base64(image_path)
     except Exception as e:
         st.error(f"Error encoding image: {e}")
         return None
@@ -257,27 +406,7 @@ def set_page_style():
     """
     Set the page style for the Streamlit app.
     """
-    st.markdown("""
-    <style>
-    .main {
-        background-color: #f5f5f5;
-    }
-    .stApp {
-        max-width: 1200px;
-        margin: 0 auto;
-    }
-    h1, h2, h3 {
-        color: #2c3e50;
-    }
-    .stButton button {
-        background-color: #3498db;
-        color: white;
-    }
-    .stButton button:hover {
-        background-color: #2980b9;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.html(_PAGE_STYLE)
 
 def display_quantum_concept(concept: str):
     """
@@ -286,77 +415,7 @@ def display_quantum_concept(concept: str):
     Args:
         concept: Name of the concept
     """
-    concepts = {
-        "superposition": """
-        ## Superposition
-        
-        Superposition is a fundamental principle of quantum mechanics where quantum systems can exist in multiple states simultaneously.
-        
-        In classical computing, a bit can be either 0 or 1. In quantum computing, a qubit can exist in a superposition of both 0 and 1 states.
-        
-        Mathematically, a qubit in superposition is represented as:
-        
-        $|\psi\\rangle = \\alpha|0\\rangle + \\beta|1\\rangle$
-        
-        where $\\alpha$ and $\\beta$ are complex numbers such that $|\\alpha|^2 + |\\beta|^2 = 1$.
-        
-        The Hadamard gate (H) is commonly used to create superposition from the $|0\\rangle$ state:
-        
-        $H|0\\rangle = \\frac{1}{\\sqrt{2}}(|0\\rangle + |1\\rangle)$
-        """,
-        
-        "entanglement": """
-        ## Entanglement
-        
-        Entanglement is a quantum phenomenon where two or more qubits become correlated in such a way that the quantum state of each qubit cannot be described independently of the others.
-        
-        When qubits are entangled, measuring one qubit instantly affects the state of the other, regardless of the distance between them.
-        
-        The Bell states are the simplest examples of entangled states:
-        
-        $|\\Phi^+\\rangle = \\frac{1}{\\sqrt{2}}(|00\\rangle + |11\\rangle)$
-        
-        $|\\Phi^-\\rangle = \\frac{1}{\\sqrt{2}}(|00\\rangle - |11\\rangle)$
-        
-        $|\\Psi^+\\rangle = \\frac{1}{\\sqrt{2}}(|01\\rangle + |10\\rangle)$
-        
-        $|\\Psi^-\\rangle = \\frac{1}{\\sqrt{2}}(|01\\rangle - |10\\rangle)$
-        
-        To create an entangled state, we typically apply a Hadamard gate to one qubit and then a CNOT gate with that qubit as the control.
-        """,
-        
-        "measurement": """
-        ## Quantum Measurement
-        
-        Measurement in quantum computing causes the quantum state to collapse to one of its basis states.
-        
-        When we measure a qubit in superposition, we get either 0 or 1 with probabilities determined by the amplitudes of the quantum state.
-        
-        For a qubit in state $|\\psi\\rangle = \\alpha|0\\rangle + \\beta|1\\rangle$:
-        - The probability of measuring 0 is $|\\alpha|^2$
-        - The probability of measuring 1 is $|\\beta|^2$
-        
-        After measurement, the qubit's state collapses to the measured value, losing its superposition.
-        
-        This probabilistic nature of quantum measurement is a key difference from classical computing.
-        """,
-        
-        "interference": """
-        ## Quantum Interference
-        
-        Quantum interference is a phenomenon where the amplitudes of quantum states can combine constructively or destructively, affecting the probabilities of measurement outcomes.
-        
-        It's similar to wave interference in physics, where waves can reinforce or cancel each other out.
-        
-        In quantum algorithms, interference is deliberately used to amplify correct answers and suppress incorrect ones.
-        
-        For example, in the Deutsch-Jozsa algorithm, interference allows us to determine if a function is constant or balanced with just one query, which would be impossible classically.
-        
-        The Hadamard gate is often used to create interference by putting qubits in superposition and then allowing them to interfere with each other.
-        """
-    }
-    
-    if concept in concepts:
-        st.markdown(concepts[concept])
+    if concept in _CONCEPT_MD:
+        st.markdown(_CONCEPT_MD[concept])
     else:
         st.warning(f"No explanation available for concept: {concept}")
\ No newline at end of file
@@ -7,13 +7,13 @@ It provides a user interface for playing the game with quantum superpositions.
 
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-import networkx as nx
+import altair as alt
 from game import QuantumTicTacToe, AIPlayer
 from quantum_engine import QuantumMove
 from typing import Dict, List, Tuple, Set, Optional, Any
 import time
 import random
+import textwrap
 
 # Set page configuration
 st.set_page_config(
@@ -23,9 +23,12 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for styling
-def set_page_style():
-    st.markdown("""
+# Seconds the board stays on screen before the AI answers, and how often to check
+_AI_MOVE_DELAY = 2.5
+_AI_POLL_INTERVAL = 0.5
+
+# Styles for the page, the buttons and the board cells
+_PAGE_STYLE = textwrap.dedent("""
     <style>
     .main {
         background-color: #f5f5f5;
@@ -86,7 +89,11 @@ def set_page_style():
         overflow-y: auto;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """)
+
+# Custom CSS for styling
+def set_page_style():
+    st.html(_PAGE_STYLE)
 
 # Initialize session state
 def init_session_state():
@@ -107,11 +114,15 @@ def init_session_state():
     
     if 'ai_thinking' not in st.session_state:
         st.session_state.ai_thinking = False
+    
+    if 'history_lines' not in st.session_state:
+        st.session_state.history_lines = []
 
 # Reset the game
 def reset_game():
     st.session_state.game.reset_game()
     st.session_state.ai_thinking = False
+    st.session_state.history_lines = []
 
 # Handle cell click
 def handle_cell_click(row, col):
@@ -130,10 +141,7 @@ def handle_cell_click(row, col):
     if (st.session_state.game_mode == "human_vs_ai" and 
         not st.session_state.game.is_game_over() and
         st.session_state.game.get_current_player() == "O"):
-        # Add a delay to allow users to see the graph before setting AI thinking
-        time.sleep(2)  # 2 second delay
-        st.session_state.ai_thinking = True
-        st.rerun()
+        schedule_ai_move()
 
 # Handle collapse click
 def handle_collapse_click(move_index, position):
@@ -152,17 +160,30 @@ def handle_collapse_click(move_index, position):
     if (st.session_state.game_mode == "human_vs_ai" and 
         not st.session_state.game.is_game_over() and
         st.session_state.game.get_current_player() == "O"):
-        # Add a delay to allow users to see the graph before setting AI thinking
-        time.sleep(2)  # 2 second delay
-        st.session_state.ai_thinking = True
-        st.rerun()
+        schedule_ai_move()
+
+# Let the AI move once the delay has passed, without blocking the script meanwhile
+def schedule_ai_move():
+    st.session_state.ai_thinking = True
+    st.session_state.ai_deadline = time.monotonic() + _AI_MOVE_DELAY
+
+# Poll for the AI's turn; only rendered while the AI is thinking, so it never
+# runs otherwise. Each tick reruns just this fragment, not the whole page.
+@st.fragment(run_every=_AI_POLL_INTERVAL)
+def ai_turn():
+    if not st.session_state.ai_thinking:
+        return
+    
+    if time.monotonic() < st.session_state.get('ai_deadline', 0.0):
+        st.info("AI is thinking...")
+        return
+    
+    make_ai_move()
+    st.rerun()
 
 # Make AI move
 def make_ai_move():
     if st.session_state.ai_thinking and not st.session_state.game.is_game_over():
-        # Add a small delay to simulate thinking
-        time.sleep(0.5)
-        
         # Check if there are uncollapsed moves that need to be collapsed
         uncollapsed_moves = st.session_state.game.get_uncollapsed_moves()
         if uncollapsed_moves and random.random() < 0.3:  # 30% chance to collapse instead of making a new move
@@ -172,11 +193,51 @@ def make_ai_move():
             # Make a new move
             pos1, pos2 = st.session_state.ai_player.make_move(st.session_state.game)
             st.session_state.game.make_move(pos1, pos2)
-        
-        st.session_state.ai_thinking = False
+    
+    # Cleared even if the game ended meanwhile, so ai_turn stops rerunning the page
+    st.session_state.ai_thinking = False
+
+# Build the entanglement graph as a Vega-Lite chart: board cells as circles, each
+# entanglement as a line between them. The browser renders it, so no figure is
+# rasterized on the server
+def entanglement_chart(edges: tuple, board_size: int) -> alt.Chart:
+    # Nodes (positions), laid out like the board
+    nodes = alt.Data(values=[
+        {"x": col, "y": -row, "label": f"({row},{col})"}
+        for row in range(board_size)
+        for col in range(board_size)
+    ])
+    
+    # Edges (entanglements)
+    lines = alt.Data(values=[
+        {"x": a[1], "y": -a[0], "x2": b[1], "y2": -b[0]}
+        for a, b in edges
+    ])
+    
+    x = alt.X("x:Q", axis=None, scale=alt.Scale(domain=[-0.5, board_size - 0.5]))
+    y = alt.Y("y:Q", axis=None, scale=alt.Scale(domain=[-board_size + 0.5, 0.5]))
+    
+    edge_layer = alt.Chart(lines).mark_rule(color="blue", strokeWidth=2, opacity=0.7).encode(
+        x=x, y=y, x2="x2:Q", y2="y2:Q"
+    )
+    node_base = alt.Chart(nodes).encode(x=x, y=y)
+    node_layer = node_base.mark_circle(size=1500, color="lightblue", opacity=1)
+    label_layer = node_base.mark_text(fontSize=12, fontWeight="bold").encode(text="label:N")
+    
+    return (edge_layer + node_layer + label_layer).properties(height=400).configure_view(stroke=None)
+
+# Game state shown outside the board: any change needs a full-page rerun
+def page_signature():
+    game = st.session_state.game
+    return (len(game.get_history()), game.is_game_over(), st.session_state.ai_thinking)
 
-# Render the game board
+# Render the game board. Cell clicks rerun only this fragment; once a click completes
+# a move (or hands the turn to the AI), the rest of the page is rerun as well.
+@st.fragment
 def render_board():
+    if st.session_state.get('page_signature') != page_signature():
+        st.rerun()
+    
     game = st.session_state.game
     board_size = game.get_board_size()
     
@@ -186,48 +247,35 @@ def render_board():
     # Get the classical board state (collapsed moves)
     classical_board = game.get_classical_board()
     
-    # Get the entanglement graph
-    entanglement_graph = game.get_entanglement_graph() if st.session_state.show_entanglement else None
+    # Get the entanglement graph as an adjacency matrix
+    entanglement_matrix = game.get_entanglement_matrix() if st.session_state.show_entanglement else None
     
     # Get the current selected positions
     selected_positions = game.get_current_move_positions()
+    if selected_positions:
+        st.write(f"Selected Position: ({selected_positions[0][0]}, {selected_positions[0][1]})")
     
     # Create a container for the board
     board_container = st.container()
     
+    # Label every uncollapsed superposition in one pass over the quantum board, with
+    # player symbols and move numbers; collapsed moves below take precedence
+    superposition_labels = {}
+    if st.session_state.show_superpositions:
+        for position, moves_at_position in quantum_board.items():
+            label = ",".join(f"{move.player}{move.move_num}" for move in moves_at_position if not move.collapsed)
+            if label:
+                superposition_labels[position] = label
+    
     with board_container:
         # Render the board
         for row in range(board_size):
             cols = st.columns(board_size)
             for col in range(board_size):
-                position = (row, col)
-                
-                # Determine cell state and content
-                cell_content = ""
-                cell_class = "board-cell"
-                
-                # Check if the position has a collapsed move
-                if classical_board[row][col] is not None:
-                    cell_content = classical_board[row][col]
-                    cell_class += f" board-cell-collapsed-{cell_content.lower()}"
-                
-                # Check if the position is in superposition
-                elif position in quantum_board and st.session_state.show_superpositions:
-                    moves_at_position = quantum_board[position]
-                    if moves_at_position:
-                        # Show superposition with player symbols and move numbers
-                        superposition_content = []
-                        for move in moves_at_position:
-                            if not move.collapsed:
-                                superposition_content.append(f"{move.player}{move.move_num}")
-                        
-                        if superposition_content:
-                            cell_content = ",".join(superposition_content)
-                            cell_class += " board-cell-superposition"
-                
-                # Check if the position is selected for the current move
-                if position in selected_positions:
-                    cell_class += " board-cell-selected"
+                # Collapsed move, else the superpositions at this position
+                cell_content = classical_board[row][col]
+                if cell_content is None:
+                    cell_content = superposition_labels.get((row, col), "")
                 
                 # Render the cell with a button
                 with cols[col]:
@@ -242,44 +290,31 @@ def render_board():
                         pass
         
         # Render entanglement graph if enabled
-        if entanglement_graph and any(connections for connections in entanglement_graph.values()):
+        if entanglement_matrix is not None and entanglement_matrix.any():
             st.subheader("Quantum Entanglement")
             
-            # Create a NetworkX graph
-            G = nx.Graph()
-            
-            # Add nodes (positions)
-            for row in range(board_size):
-                for col in range(board_size):
-                    G.add_node((row, col), pos=(col, -row))  # Position for visualization
-            
-            # Add edges (entanglements)
-            for pos, connected_positions in entanglement_graph.items():
-                for connected_pos in connected_positions:
-                    G.add_edge(pos, connected_pos)
-            
-            # Get node positions for visualization
-            pos = nx.get_node_attributes(G, 'pos')
-            
-            # Create a matplotlib figure
-            fig, ax = plt.subplots(figsize=(5, 5))
-            
-            # Draw the graph
-            nx.draw(
-                G, pos, ax=ax,
-                with_labels=True,
-                node_color='lightblue',
-                node_size=500,
-                font_size=10,
-                font_weight='bold',
-                labels={node: f"({node[0]},{node[1]})" for node in G.nodes()},
-                edge_color='blue',
-                width=2,
-                alpha=0.7
+            # Canonical edge list from the upper triangle: each entanglement once, sorted
+            edges = tuple(
+                (divmod(i, board_size), divmod(j, board_size))
+                for i, j in np.argwhere(np.triu(entanglement_matrix, k=1)).tolist()
             )
             
             # Display the graph
-            st.pyplot(fig)
+            st.altair_chart(entanglement_chart(edges, board_size), width="stretch")
+
+# Format one move-history event as markdown
+def format_history_event(game, i, event):
+    if "move" in event:
+        pos1, pos2 = event["move"]
+        line = f"{i+1}. Player {event['player']} moved to ({pos1[0]}, {pos1[1]}) and ({pos2[0]}, {pos2[1]})"
+    else:
+        move_index, position = event["collapse"]
+        line = f"{i+1}. Player {event['player']} collapsed move {move_index} to ({position[0]}, {position[1]})"
+    
+    if event["collapsed"]:
+        collapsed_moves = ", ".join(str(game.get_move_by_index(move_index)) for move_index, _ in event["collapsed"])
+        line += f"\n\n   Collapsed moves: {collapsed_moves}"
+    return line
 
 # Render game info and controls
 def render_game_info():
@@ -292,11 +327,6 @@ def render_game_info():
     current_player = game.get_current_player()
     st.write(f"Current Player: **{current_player}**")
     
-    # Selected positions
-    selected_positions = game.get_current_move_positions()
-    if selected_positions:
-        st.write(f"Selected Position: ({selected_positions[0][0]}, {selected_positions[0][1]})")
-    
     # Game over status
     if game.is_game_over():
         winner = game.get_winner()
@@ -306,7 +336,7 @@ def render_game_info():
             st.info("Game Over! It's a draw!")
     
     # Uncollapsed moves
-    uncollapsed_moves = game.get_uncollapsed_moves()
+    uncollapsed_moves = game.get_uncollapsed_moves_with_index()
     if uncollapsed_moves:
         st.subheader("Uncollapsed Quantum Moves")
         
@@ -314,7 +344,7 @@ def render_game_info():
         moves_container = st.container()
         
         with moves_container:
-            for i, move in enumerate(uncollapsed_moves):
+            for i, (move_index, move) in enumerate(uncollapsed_moves):
                 move_str = str(move)
                 positions_str = ", ".join([f"({pos[0]}, {pos[1]})" for pos in move.positions])
                 
@@ -331,7 +361,7 @@ def render_game_info():
                             f"Collapse to ({pos[0]}, {pos[1]})",
                             key=f"collapse_{i}_{pos[0]}_{pos[1]}",
                             on_click=handle_collapse_click,
-                            args=(game.board.moves.index(move), pos),
+                            args=(move_index, pos),
                             disabled=st.session_state.ai_thinking
                         ):
                             pass
@@ -341,22 +371,41 @@ def render_game_info():
     history = game.get_history()
     
     if history:
-        history_container = st.container()
+        # Events are only ever appended, so format just the new ones and keep the rest
+        history_lines = st.session_state.history_lines
+        if len(history_lines) > len(history):
+            history_lines.clear()
+        for i in range(len(history_lines), len(history)):
+            history_lines.append(format_history_event(game, i, history[i]))
         
-        with history_container:
-            for i, event in enumerate(history):
-                if "move" in event:
-                    pos1, pos2 = event["move"]
-                    st.write(f"{i+1}. Player {event['player']} moved to ({pos1[0]}, {pos1[1]}) and ({pos2[0]}, {pos2[1]})")
-                elif "collapse" in event:
-                    move_index, position = event["collapse"]
-                    st.write(f"{i+1}. Player {event['player']} collapsed move {move_index} to ({position[0]}, {position[1]})")
-                
-                if event["collapsed_moves"]:
-                    st.write(f"   Collapsed moves: {', '.join(event['collapsed_moves'])}")
+        # One markdown block in a scrollable container, instead of a widget per line
+        with st.container(height=300):
+            st.markdown("\n\n".join(history_lines))
     else:
         st.write("No moves yet.")
 
+# Sidebar explanations of the quantum concepts behind the game
+_SUPERPOSITION_MD = """
+In Quantum Tic Tac Toe, each move exists in a **superposition** of two positions until it's measured (collapsed).
+
+This means a player's mark can be in two places at once, representing the quantum principle that particles can exist in multiple states simultaneously until observed.
+"""
+
+_ENTANGLEMENT_MD = """
+When two quantum moves share a position, they become **entangled**. If one move collapses, it can force other entangled moves to collapse as well.
+
+This represents quantum entanglement, where the state of one particle is connected to the state of another, regardless of distance.
+"""
+
+_MEASUREMENT_MD = """
+**Measurement** (or collapse) happens when:
+
+1. Two moves interfere at the same position
+2. A player chooses to force a collapse
+
+When a move collapses, it randomly chooses one of its superposition positions, following the probabilistic nature of quantum measurement.
+"""
+
 # Render sidebar controls
 def render_sidebar():
     st.sidebar.title("Quantum Tic Tac Toe")
@@ -413,28 +462,13 @@ def render_sidebar():
     # Quantum concepts explanation
     st.sidebar.header("Quantum Concepts")
     with st.sidebar.expander("Superposition"):
-        st.write("""
-        In Quantum Tic Tac Toe, each move exists in a **superposition** of two positions until it's measured (collapsed).
-        
-        This means a player's mark can be in two places at once, representing the quantum principle that particles can exist in multiple states simultaneously until observed.
-        """)
+        st.write(_SUPERPOSITION_MD)
     
     with st.sidebar.expander("Entanglement"):
-        st.write("""
-        When two quantum moves share a position, they become **entangled**. If one move collapses, it can force other entangled moves to collapse as well.
-        
-        This represents quantum entanglement, where the state of one particle is connected to the state of another, regardless of distance.
-        """)
+        st.write(_ENTANGLEMENT_MD)
     
     with st.sidebar.expander("Measurement/Collapse"):
-        st.write("""
-        **Measurement** (or collapse) happens when:
-        
-        1. Two moves interfere at the same position
-        2. A player chooses to force a collapse
-        
-        When a move collapses, it randomly chooses one of its superposition positions, following the probabilistic nature of quantum measurement.
-        """)
+        st.write(_MEASUREMENT_MD)
 
 # Main function
 def main():
@@ -458,6 +492,7 @@ def main():
     
     with col1:
         # Render the game board
+        st.session_state.page_signature = page_signature()
         render_board()
     
     with col2:
@@ -466,10 +501,7 @@ def main():
     
     # Make AI move if it's AI's turn
     if st.session_state.ai_thinking:
-        # Add a delay to allow users to see the graph before the AI move
-        time.sleep(2)  # 2 second delay
-        make_ai_move()
-        st.rerun()
+        ai_turn()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,9 +5,151 @@ This module provides the game logic for Quantum Tic Tac Toe, including
 game state management, move validation, and AI opponent functionality.
 """
 
-from quantum_engine import QuantumBoard, QuantumMove
-from typing import Dict, List, Tuple, Set, Optional, Union, Any
+from quantum_engine import QuantumBoard, QuantumMove, CELL_X, CELL_O
+from typing import Callable, Dict, Iterator, List, Tuple, Set, Optional, Union, Any
+from functools import lru_cache
 import random
+import numpy as np
+
+# Lookahead (in single marks) of the hard AI's search on the classical board; 3x3 is
+# small enough to search to the end, which makes its cell scores perfect play
+_SEARCH_DEPTH = {3: 9}
+_DEFAULT_SEARCH_DEPTH = 2
+
+# Bounds on the search caches, which live as long as the server process. Collapses
+# need not alternate players, so a 3x3 board can hold any mix of up to 5 X and 4 O
+# marks: about 18k (own, other) positions for either side to move, and 42k search
+# nodes below them. Both fit, so perfect play stays fully memoized, while positions
+# from larger boards are evicted instead of accumulating
+_SEARCH_CACHE_SIZE = 1 << 16
+_SCORE_CACHE_SIZE = 1 << 15
+
+
+@lru_cache(maxsize=None)
+def _winning_lines(size: int) -> Tuple[int, ...]:
+    """
+    Get the winning lines of a board as bitboards (bit row * size + col).
+    
+    Args:
+        size: Size of the board
+        
+    Returns:
+        Tuple of bitmasks for every row, column and both diagonals
+    """
+    lines = []
+    for i in range(size):
+        lines.append(sum(1 << (i * size + j) for j in range(size)))
+        lines.append(sum(1 << (j * size + i) for j in range(size)))
+    lines.append(sum(1 << (i * size + i) for i in range(size)))
+    lines.append(sum(1 << (i * size + size - 1 - i) for i in range(size)))
+    return tuple(lines)
+
+
+@lru_cache(maxsize=None)
+def _lines_through(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Get the winning lines passing through each cell.
+    
+    Args:
+        size: Size of the board
+        
+    Returns:
+        Tuple indexed by cell bit, each holding the line bitmasks through that cell
+    """
+    lines = _winning_lines(size)
+    return tuple(tuple(line for line in lines if line >> bit & 1) for bit in range(size * size))
+
+
+def _negamax(own: int, other: int, size: int, depth: int, alpha: int, beta: int) -> int:
+    """
+    Depth-limited negamax with alpha-beta pruning over the classical board.
+    
+    Args:
+        own: Bitboard of the player to move
+        other: Bitboard of the opponent
+        size: Size of the board
+        depth: Remaining number of marks to search
+        alpha: Lower bound of the search window
+        beta: Upper bound of the search window
+        
+    Returns:
+        1 if the player to move wins, -1 if they lose, 0 for a draw or unresolved position
+    """
+    lines = _winning_lines(size)
+    if any(own & line == line for line in lines):
+        return 1
+    if any(other & line == line for line in lines):
+        return -1
+    return _negamax_search(own, other, size, depth, alpha, beta)
+
+
+@lru_cache(maxsize=_SEARCH_CACHE_SIZE)
+def _negamax_search(own: int, other: int, size: int, depth: int, alpha: int, beta: int) -> int:
+    """
+    Search kernel of _negamax for positions without a completed line.
+    
+    A new line can only pass through the cell just marked, so wins are
+    detected when a child is generated instead of rescanning every line
+    at every node. The lru_cache doubles as a transposition table.
+    
+    Args:
+        own: Bitboard of the player to move
+        other: Bitboard of the opponent
+        size: Size of the board
+        depth: Remaining number of marks to search
+        alpha: Lower bound of the search window
+        beta: Upper bound of the search window
+        
+    Returns:
+        1 if the player to move wins, -1 if they lose, 0 for a draw or unresolved position
+    """
+    empty = ~(own | other) & ((1 << (size * size)) - 1)
+    if depth == 0 or not empty:
+        return 0
+    
+    # Try cells on lines we already hold first so cutoffs fire early
+    lines_through = _lines_through(size)
+    children = [bit for bit in range(size * size) if empty >> bit & 1]
+    children.sort(key=lambda bit: sum(bin(own & line).count('1') for line in lines_through[bit]), reverse=True)
+    
+    best = -1
+    for bit in children:
+        marked = own | (1 << bit)
+        if any(marked & line == line for line in lines_through[bit]):
+            return 1
+        score = -_negamax_search(other, marked, size, depth - 1, -beta, -alpha)
+        if score > best:
+            best = score
+        if best > alpha:
+            alpha = best
+        if alpha >= beta:
+            break
+    return best
+
+
+@lru_cache(maxsize=_SCORE_CACHE_SIZE)
+def _cell_scores(own: int, other: int, size: int, depth: int) -> Tuple[Optional[int], ...]:
+    """
+    Score every cell for the player to move, memoized per position.
+    
+    On 3x3 the full-depth search covers the whole classical state space, so
+    after the first game this acts as a precomputed perfect-play table.
+    
+    Args:
+        own: Bitboard of the player to move
+        other: Bitboard of the opponent
+        size: Size of the board
+        depth: Number of marks to search, including the scored one
+        
+    Returns:
+        Tuple indexed by cell bit with the negamax score of marking that cell,
+        or None for occupied cells
+    """
+    occupied = own | other
+    return tuple(
+        None if occupied >> bit & 1 else -_negamax(other, own | (1 << bit), size, depth - 1, -1, 1)
+        for bit in range(size * size)
+    )
 
 
 class QuantumTicTacToe:
@@ -28,6 +170,32 @@ class QuantumTicTacToe:
         self.board = QuantumBoard(size=board_size)
         self.history: List[Dict[str, Any]] = []
         self.current_move_positions: List[Tuple[int, int]] = []
+        # Derived board views, keyed by name and tagged with the board version they were computed for
+        self._derived_cache: Dict[str, Tuple[int, Any]] = {}
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle without the derived views; they would hold moves detached from the unpickled board."""
+        state = self.__dict__.copy()
+        state['_derived_cache'] = {}
+        return state
+    
+    def _derived(self, name: str, compute: Callable[[], Any]) -> Any:
+        """
+        Get a derived view of the board, recomputing it only after the board changes.
+        
+        Args:
+            name: Cache key of the view
+            compute: Zero-argument callable producing the view
+            
+        Returns:
+            The cached or freshly computed view; callers must not modify it
+        """
+        version = self.board._version
+        cached = self._derived_cache.get(name)
+        if cached is None or cached[0] != version:
+            cached = (version, compute())
+            self._derived_cache[name] = cached
+        return cached[1]
     
     def get_board_size(self) -> int:
         """Get the size of the board."""
@@ -99,9 +267,8 @@ class QuantumTicTacToe:
             return False
         
         # Check if the position already has a collapsed move
-        for move in self.board.moves:
-            if move.is_collapsed_at(position):
-                return False
+        if self.board.is_collapsed(position):
+            return False
         
         # Check if the position is already selected for the current move
         if position in self.current_move_positions:
@@ -124,19 +291,15 @@ class QuantumTicTacToe:
         if not self.board.is_valid_move(pos1, pos2):
             return False
         
-        # Record the game state before the move
-        prev_state = self._get_game_state()
-        
         # Make the move
+        player = self.board.current_player
         collapsed_moves = self.board.make_move(pos1, pos2)
         
-        # Record the move in the history
+        # Record the move in the history as a delta; state_at() rebuilds full snapshots
         self.history.append({
-            "player": prev_state["current_player"],
+            "player": player,
             "move": (pos1, pos2),
-            "collapsed_moves": [str(move) for move in collapsed_moves],
-            "prev_state": prev_state,
-            "new_state": self._get_game_state()
+            "collapsed": self._collapse_outcomes(collapsed_moves)
         })
         
         return True
@@ -157,39 +320,82 @@ class QuantumTicTacToe:
         if move is None or move.collapsed or position not in move.positions:
             return False
         
-        # Record the game state before the collapse
-        prev_state = self._get_game_state()
-        
         # Force the collapse
+        player = self.board.current_player
         collapsed_moves = self.board.force_collapse(move_index, position)
         
-        # Record the collapse in the history
+        # Record the collapse in the history as a delta
         self.history.append({
-            "player": prev_state["current_player"],
+            "player": player,
             "collapse": (move_index, position),
-            "collapsed_moves": [str(move) for move in collapsed_moves],
-            "prev_state": prev_state,
-            "new_state": self._get_game_state()
+            "collapsed": self._collapse_outcomes(collapsed_moves)
         })
         
         return True
     
-    def _get_game_state(self) -> Dict[str, Any]:
+    @staticmethod
+    def _collapse_outcomes(collapsed_moves: List[QuantumMove]) -> List[Tuple[int, Tuple[int, int]]]:
+        """
+        Record where each collapsed move landed.
+        
+        Args:
+            collapsed_moves: Moves returned by the board's make_move or force_collapse
+            
+        Returns:
+            List of (move_index, position) pairs, in the order the board reported them
+        """
+        return [(move.move_num - 1, move.collapsed_position) for move in collapsed_moves]
+    
+    def _get_game_state(self, board: Optional[QuantumBoard] = None) -> Dict[str, Any]:
         """
-        Get a snapshot of the current game state.
+        Get a snapshot of a game state.
         
+        Args:
+            board: Board to snapshot (default: the current board)
+            
         Returns:
             Dictionary containing the game state
         """
+        if board is None:
+            board = self.board
         return {
-            "current_player": self.board.current_player,
-            "game_over": self.board.game_over,
-            "winner": self.board.winner,
-            "classical_board": self.board.get_classical_board(),
-            "uncollapsed_moves": [str(move) for move in self.board.get_uncollapsed_moves()],
-            "collapsed_moves": [str(move) for move in self.board.get_collapsed_moves()]
+            "current_player": board.current_player,
+            "game_over": board.game_over,
+            "winner": board.winner,
+            "classical_board": board.get_classical_board(),
+            "uncollapsed_moves": [str(move) for move in board.get_uncollapsed_moves()],
+            "collapsed_moves": [str(move) for move in board.get_collapsed_moves()]
         }
     
+    def state_at(self, index: int) -> Dict[str, Any]:
+        """
+        Reconstruct the game state after the first `index` history events.
+        
+        The recorded collapse outcomes are replayed onto a fresh board, so
+        random interference resolutions come out exactly as they were played.
+        
+        Args:
+            index: Number of history events to replay (0 to len(history))
+            
+        Returns:
+            Dictionary containing the game state, as produced by _get_game_state()
+        """
+        if not 0 <= index <= len(self.history):
+            raise ValueError(f"Invalid history index: {index}")
+        
+        board = QuantumBoard(size=self.board.size)
+        for event in self.history[:index]:
+            if "move" in event:
+                board.move_count += 1
+                board.moves.append(QuantumMove(*event["move"], event["player"], board.move_count))
+                board.current_player = 'O' if event["player"] == 'X' else 'X'
+            for move_index, position in event["collapsed"]:
+                board.moves[move_index].collapse_to(position)
+            board._refresh_collapse_state()
+            board._check_game_state()
+        
+        return self._get_game_state(board)
+    
     def get_classical_board(self) -> List[List[Optional[str]]]:
         """
         Get the classical board state (only collapsed moves).
@@ -197,7 +403,16 @@ class QuantumTicTacToe:
         Returns:
             2D list representing the board, with each cell containing 'X', 'O', or None
         """
-        return self.board.get_classical_board()
+        return self._derived('classical_board', self.board.get_classical_board)
+    
+    def get_classical_bytes(self) -> bytes:
+        """
+        Get the classical board state as a flat buffer (only collapsed moves).
+        
+        Returns:
+            Bytes indexed by row * size + col, each cell holding CELL_EMPTY, CELL_X or CELL_O
+        """
+        return self._derived('classical_bytes', self.board.get_classical_bytes)
     
     def get_quantum_board(self) -> Dict[Tuple[int, int], List[QuantumMove]]:
         """
@@ -206,7 +421,7 @@ class QuantumTicTacToe:
         Returns:
             Dictionary mapping positions to lists of quantum moves at those positions
         """
-        return self.board.get_quantum_board()
+        return self._derived('quantum_board', self.board.get_quantum_board)
     
     def get_uncollapsed_moves(self) -> List[QuantumMove]:
         """
@@ -215,7 +430,16 @@ class QuantumTicTacToe:
         Returns:
             List of uncollapsed moves
         """
-        return self.board.get_uncollapsed_moves()
+        return self._derived('uncollapsed_moves', self.board.get_uncollapsed_moves)
+    
+    def get_uncollapsed_moves_with_index(self) -> List[Tuple[int, QuantumMove]]:
+        """
+        Get all uncollapsed moves together with their index in the move list.
+        
+        Returns:
+            List of (move_index, move) tuples, where move_index is what force_collapse expects
+        """
+        return self._derived('uncollapsed_moves_with_index', self.board.get_uncollapsed_moves_with_index)
     
     def get_collapsed_moves(self) -> List[QuantumMove]:
         """
@@ -233,7 +457,16 @@ class QuantumTicTacToe:
         Returns:
             Dictionary mapping positions to sets of entangled positions
         """
-        return self.board.get_entanglement_graph()
+        return self._derived('entanglement_graph', self.board.get_entanglement_graph)
+    
+    def get_entanglement_matrix(self) -> np.ndarray:
+        """
+        Get the entanglement graph of the board as an adjacency matrix.
+        
+        Returns:
+            Symmetric boolean array indexed by cell (row * size + col)
+        """
+        return self._derived('entanglement_matrix', self.board.get_entanglement_matrix)
     
     def get_superposition_count(self, position: Tuple[int, int]) -> int:
         """
@@ -266,7 +499,16 @@ class QuantumTicTacToe:
         Returns:
             List of valid moves, each represented as a pair of positions
         """
-        return self.board.get_valid_moves()
+        return self._derived('valid_moves', self.board.get_valid_moves)
+    
+    def iter_valid_moves(self) -> Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """
+        Iterate over all valid quantum moves without building a list.
+        
+        Returns:
+            Iterator of valid moves, each represented as a pair of positions
+        """
+        return self.board.iter_valid_moves()
     
     def get_move_by_index(self, index: int) -> Optional[QuantumMove]:
         """
@@ -306,6 +548,7 @@ class QuantumTicTacToe:
         """Reset the game to its initial state."""
         board_size = self.board.size
         self.board = QuantumBoard(size=board_size)
+        self._derived_cache = {}
         self.history = []
         self.current_move_positions = []
 
@@ -325,6 +568,7 @@ class AIPlayer:
             difficulty: Difficulty level ('easy', 'medium', or 'hard')
         """
         self.difficulty = difficulty
+        self._rng = random.Random()
     
     def make_move(self, game: QuantumTicTacToe) -> Tuple[Tuple[int, int], Tuple[int, int]]:
         """
@@ -353,11 +597,17 @@ class AIPlayer:
         Returns:
             A pair of positions representing the AI's move
         """
-        valid_moves = game.get_valid_moves()
-        if not valid_moves:
+        # Reservoir-sample the moves as they are generated instead of listing them all
+        pick = None
+        count = 0
+        for move in game.iter_valid_moves():
+            count += 1
+            if self._rng.randrange(count) == 0:
+                pick = move
+        if pick is None:
             raise ValueError("No valid moves available")
         
-        return random.choice(valid_moves)
+        return pick
     
     def _make_medium_move(self, game: QuantumTicTacToe) -> Tuple[Tuple[int, int], Tuple[int, int]]:
         """
@@ -379,29 +629,21 @@ class AIPlayer:
             raise ValueError("No valid moves available")
         
         # Get opponent's uncollapsed moves
+        player = game.get_current_player()
         opponent_moves = [move for move in game.get_uncollapsed_moves() 
-                         if move.player != game.get_current_player()]
+                         if move.player != player]
         
         # Try to create interference with opponent's moves
         if opponent_moves:
-            # Get positions from opponent's uncollapsed moves
-            opponent_positions = set()
-            for move in opponent_moves:
-                opponent_positions.update(move.positions)
-            
-            # Find moves that interfere with opponent's positions
-            interfering_moves = []
-            for move in valid_moves:
-                pos1, pos2 = move
-                if pos1 in opponent_positions or pos2 in opponent_positions:
-                    interfering_moves.append(move)
+            # Find moves that touch any cell of the opponent's uncollapsed moves
+            interfering_move = self._pick_interfering_move(valid_moves, opponent_moves, game.get_board_size())
             
-            # If we found interfering moves, choose one randomly
-            if interfering_moves:
-                return random.choice(interfering_moves)
+            # If we found an interfering move, play it
+            if interfering_move is not None:
+                return interfering_move
         
         # If no interfering moves, make a random move
-        return random.choice(valid_moves)
+        return self._rng.choice(valid_moves)
     
     def _make_strategic_move(self, game: QuantumTicTacToe) -> Tuple[Tuple[int, int], Tuple[int, int]]:
         """
@@ -410,9 +652,10 @@ class AIPlayer:
         This AI will:
         1. Try to win if possible
         2. Try to block opponent from winning
-        3. Try to create interference with opponent's uncollapsed moves
-        4. Try to set up potential winning moves
-        5. Otherwise, make a random move
+        3. Search ahead on the classical board and keep moves through the best cells
+        4. Try to create interference with opponent's uncollapsed moves
+        5. Try to set up potential winning moves
+        6. Otherwise, make a random move
         
         Args:
             game: The current game state
@@ -425,64 +668,34 @@ class AIPlayer:
         if not valid_moves:
             raise ValueError("No valid moves available")
         
-        # Get the classical board
-        board = game.get_classical_board()
+        # Get the classical board as a flat buffer
+        board = game.get_classical_bytes()
         size = game.get_board_size()
         player = game.get_current_player()
-        opponent = 'O' if player == 'X' else 'X'
         
-        # Check for winning moves
-        for pos1, pos2 in valid_moves:
-            # Try both positions to see if either leads to a win
-            for pos in [pos1, pos2]:
-                row, col = pos
-                
-                # Check if this position would complete a row
-                row_count = sum(1 for c in range(size) if board[row][c] == player or (c == col))
-                if row_count == size:
-                    return (pos1, pos2)
-                
-                # Check if this position would complete a column
-                col_count = sum(1 for r in range(size) if board[r][col] == player or (r == row))
-                if col_count == size:
-                    return (pos1, pos2)
-                
-                # Check if this position would complete a diagonal
-                if row == col:  # Main diagonal
-                    diag_count = sum(1 for i in range(size) if board[i][i] == player or (i == row and i == col))
-                    if diag_count == size:
-                        return (pos1, pos2)
-                
-                if row + col == size - 1:  # Anti-diagonal
-                    anti_diag_count = sum(1 for i in range(size) if board[i][size-1-i] == player or (i == row and size-1-i == col))
-                    if anti_diag_count == size:
-                        return (pos1, pos2)
-        
-        # Check for blocking moves (same logic, but for opponent)
+        # Bitboards of each player's marks, tested against the winning lines cached per board size
+        own, other = self._bitboards(board, player)
+        
+        # Check for winning and blocking moves in one pass: either position would complete
+        # a line; a win returns immediately, the first block is kept as the fallback
+        blocking_move = None
         for pos1, pos2 in valid_moves:
-            for pos in [pos1, pos2]:
-                row, col = pos
-                
-                # Check if this position would block a row
-                row_count = sum(1 for c in range(size) if board[row][c] == opponent or (c == col))
-                if row_count == size:
-                    return (pos1, pos2)
-                
-                # Check if this position would block a column
-                col_count = sum(1 for r in range(size) if board[r][col] == opponent or (r == row))
-                if col_count == size:
-                    return (pos1, pos2)
-                
-                # Check if this position would block a diagonal
-                if row == col:  # Main diagonal
-                    diag_count = sum(1 for i in range(size) if board[i][i] == opponent or (i == row and i == col))
-                    if diag_count == size:
-                        return (pos1, pos2)
-                
-                if row + col == size - 1:  # Anti-diagonal
-                    anti_diag_count = sum(1 for i in range(size) if board[i][size-1-i] == opponent or (i == row and size-1-i == col))
-                    if anti_diag_count == size:
-                        return (pos1, pos2)
+            if self._completes_line(own, pos1, size) or self._completes_line(own, pos2, size):
+                return (pos1, pos2)
+            if blocking_move is None and (self._completes_line(other, pos1, size)
+                                          or self._completes_line(other, pos2, size)):
+                blocking_move = (pos1, pos2)
+        if blocking_move is not None:
+            return blocking_move
+        
+        # Look ahead on the classical board and keep only moves through the best cells
+        scores = _cell_scores(own, other, size, _SEARCH_DEPTH.get(size, _DEFAULT_SEARCH_DEPTH))
+        open_scores = [score for score in scores if score is not None]
+        best_score = max(open_scores)
+        if best_score > min(open_scores):
+            valid_moves = [(pos1, pos2) for pos1, pos2 in valid_moves
+                           if scores[pos1[0] * size + pos1[1]] == best_score
+                           or scores[pos2[0] * size + pos2[1]] == best_score]
         
         # Get opponent's uncollapsed moves
         opponent_moves = [move for move in game.get_uncollapsed_moves() 
@@ -490,43 +703,93 @@ class AIPlayer:
         
         # Try to create interference with opponent's moves
         if opponent_moves:
-            # Get positions from opponent's uncollapsed moves
-            opponent_positions = set()
-            for move in opponent_moves:
-                opponent_positions.update(move.positions)
+            # Find moves that touch any cell of the opponent's uncollapsed moves
+            interfering_move = self._pick_interfering_move(valid_moves, opponent_moves, size)
             
-            # Find moves that interfere with opponent's positions
-            interfering_moves = []
-            for move in valid_moves:
-                pos1, pos2 = move
-                if pos1 in opponent_positions or pos2 in opponent_positions:
-                    interfering_moves.append(move)
-            
-            # If we found interfering moves, choose one randomly
-            if interfering_moves:
-                return random.choice(interfering_moves)
+            # If we found an interfering move, play it
+            if interfering_move is not None:
+                return interfering_move
         
         # Try to set up potential winning moves
-        strategic_moves = []
-        for pos1, pos2 in valid_moves:
-            # Prioritize moves that include center position
-            center = size // 2
-            if (center, center) in [pos1, pos2]:
-                strategic_moves.append((pos1, pos2))
-                continue
-            
-            # Prioritize moves that include corner positions
-            corners = [(0, 0), (0, size-1), (size-1, 0), (size-1, size-1)]
-            if pos1 in corners or pos2 in corners:
-                strategic_moves.append((pos1, pos2))
-                continue
+        # Prioritize moves that include the center or a corner position
+        center = (size // 2, size // 2)
+        corners = frozenset([(0, 0), (0, size-1), (size-1, 0), (size-1, size-1)])
+        strategic_moves = [(pos1, pos2) for pos1, pos2 in valid_moves
+                           if pos1 == center or pos2 == center or pos1 in corners or pos2 in corners]
         
         # If we found strategic moves, choose one randomly
         if strategic_moves:
-            return random.choice(strategic_moves)
+            return self._rng.choice(strategic_moves)
         
         # If no strategic moves, make a random move
-        return random.choice(valid_moves)
+        return self._rng.choice(valid_moves)
+    
+    @staticmethod
+    def _bitboards(board: bytes, player: str) -> Tuple[int, int]:
+        """
+        Encode the classical board as bitboards (bit row * size + col).
+        
+        Args:
+            board: Flat classical board from get_classical_bytes()
+            player: Player whose marks go in the first bitboard
+            
+        Returns:
+            Tuple of (player's bitboard, opponent's bitboard)
+        """
+        x_board = o_board = 0
+        for bit, cell in enumerate(board):
+            if cell == CELL_X:
+                x_board |= 1 << bit
+            elif cell == CELL_O:
+                o_board |= 1 << bit
+        return (x_board, o_board) if player == 'X' else (o_board, x_board)
+    
+    def _pick_interfering_move(self, valid_moves: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+                               opponent_moves: List[QuantumMove],
+                               size: int) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """
+        Pick a random move sharing a cell with the opponent's uncollapsed moves.
+        
+        Args:
+            valid_moves: Candidate moves from get_valid_moves()
+            opponent_moves: Opponent's uncollapsed moves
+            size: Size of the board
+            
+        Returns:
+            A uniformly chosen interfering move, or None if no move interferes
+        """
+        # One bitmask of opponent-touched cells (bit row * size + col) replaces per-position set lookups
+        opponent_mask = 0
+        for move in opponent_moves:
+            for row, col in move.positions:
+                opponent_mask |= 1 << (row * size + col)
+        
+        # Reservoir-sample the matches in a single pass instead of collecting them first
+        pick = None
+        matches = 0
+        for pos1, pos2 in valid_moves:
+            if opponent_mask >> (pos1[0] * size + pos1[1]) & 1 or opponent_mask >> (pos2[0] * size + pos2[1]) & 1:
+                matches += 1
+                if self._rng.randrange(matches) == 0:
+                    pick = (pos1, pos2)
+        return pick
+    
+    @staticmethod
+    def _completes_line(bitboard: int, position: Tuple[int, int], size: int) -> bool:
+        """
+        Check whether a mark at a position would complete a line.
+        
+        Args:
+            bitboard: Bitboard of one player's marks from _bitboards()
+            position: Position of the new mark
+            size: Size of the board
+            
+        Returns:
+            True if the row, column or a diagonal through the position would be full
+        """
+        bit = position[0] * size + position[1]
+        marked = bitboard | (1 << bit)
+        return any(marked & line == line for line in _lines_through(size)[bit])
     
     def decide_collapse(self, game: QuantumTicTacToe) -> Tuple[int, Tuple[int, int]]:
         """
@@ -538,55 +801,48 @@ class AIPlayer:
         Returns:
             Tuple of (move_index, position) representing the collapse decision
         """
-        # Get uncollapsed moves
-        uncollapsed_moves = game.get_uncollapsed_moves()
+        # Get uncollapsed moves, each with its index in the move list
+        uncollapsed_moves = game.get_uncollapsed_moves_with_index()
         if not uncollapsed_moves:
             raise ValueError("No uncollapsed moves available")
         
         # For easy difficulty, make a random choice
         if self.difficulty == "easy":
-            move = random.choice(uncollapsed_moves)
-            move_index = game.board.moves.index(move)
-            position = random.choice(move.positions)
+            move_index, move = self._rng.choice(uncollapsed_moves)
+            position = self._rng.choice(move.positions)
             return (move_index, position)
         
         # For medium and hard difficulties, be more strategic
         player = game.get_current_player()
         
         # Prioritize collapsing opponent's moves
-        opponent_moves = [move for move in uncollapsed_moves if move.player != player]
-        if opponent_moves:
-            move = random.choice(opponent_moves)
-            move_index = game.board.moves.index(move)
-            
-            # Try to collapse in a way that blocks the opponent
-            board = game.get_classical_board()
-            size = game.get_board_size()
-            
-            for pos in move.positions:
-                row, col = pos
-                
-                # Check if collapsing here would block a win
-                # (Similar logic to _make_strategic_move, but for blocking)
-                
-                # For hard difficulty, do a more thorough analysis
-                if self.difficulty == "hard":
-                    # TODO: Implement more sophisticated collapse strategy
-                    pass
-            
-            # If no strategic collapse found, choose randomly
-            position = random.choice(move.positions)
-            return (move_index, position)
-        
-        # If no opponent moves, collapse own moves strategically
-        move = random.choice(uncollapsed_moves)
-        move_index = game.board.moves.index(move)
+        opponent_moves = [(index, move) for index, move in uncollapsed_moves if move.player != player]
+        candidates = opponent_moves or uncollapsed_moves
         
-        # For hard difficulty, try to collapse to create winning opportunities
+        # For hard difficulty, search every collapse outcome with us to move next
         if self.difficulty == "hard":
-            # TODO: Implement more sophisticated collapse strategy
-            pass
-        
-        # If no strategic collapse found, choose randomly
-        position = random.choice(move.positions)
-        return (move_index, position)
\ No newline at end of file
+            board = game.get_classical_bytes()
+            size = game.get_board_size()
+            own, other = self._bitboards(board, player)
+            depth = _SEARCH_DEPTH.get(size, _DEFAULT_SEARCH_DEPTH)
+            
+            best_decisions = []
+            best_score = -2
+            for move_index, move in candidates:
+                for row, col in move.positions:
+                    bit = 1 << (row * size + col)
+                    if move.player == player:
+                        score = _negamax(own | bit, other, size, depth, -1, 1)
+                    else:
+                        score = _negamax(own, other | bit, size, depth, -1, 1)
+                    if score > best_score:
+                        best_score = score
+                        best_decisions = []
+                    if score == best_score:
+                        best_decisions.append((move_index, (row, col)))
+            return self._rng.choice(best_decisions)
+        
+        # Otherwise pick a move and collapse it randomly
+        move_index, move = self._rng.choice(candidates)
+        position = self._rng.choice(move.positions)
+        return (move_index, position)
@@ -6,9 +6,41 @@ including superpositions, entanglement, and measurement.
 """
 
 import numpy as np
-from typing import Dict, List, Tuple, Set, Optional, Union, Any
+from typing import Dict, Iterator, List, Tuple, Set, Optional, Union, Any
+from functools import lru_cache
+from itertools import combinations
 import random
 
+# Cell codes of the flat classical board from get_classical_bytes()
+CELL_EMPTY = 0
+CELL_X = 1
+CELL_O = 2
+
+
+
+@lru_cache(maxsize=None)
+def _packed_line_masks(size: int) -> Tuple[int, ...]:
+    """
+    Get X's winning lines on a board packed with 2 bits per cell.
+    
+    Cell (row, col) occupies bits 2 * (row * size + col) and the one above it,
+    holding 01 for X and 10 for O, so shifting a mask left by one gives O's line.
+    
+    Args:
+        size: Size of the board
+        
+    Returns:
+        Tuple of masks for every row, then every column, then both diagonals
+    """
+    def line(cells):
+        return sum(1 << (2 * (row * size + col)) for row, col in cells)
+    
+    rows = [line((row, col) for col in range(size)) for row in range(size)]
+    cols = [line((row, col) for row in range(size)) for col in range(size)]
+    diag = line((i, i) for i in range(size))
+    anti_diag = line((i, size - 1 - i) for i in range(size))
+    return tuple(rows + cols + [diag, anti_diag])
+
 
 class QuantumMove:
     """
@@ -17,6 +49,8 @@ class QuantumMove:
     A quantum move is a superposition of two possible positions on the board.
     """
     
+    __slots__ = ('positions', 'player', 'move_num', 'collapsed', 'collapsed_position', '_str_cache')
+    
     def __init__(self, pos1: Tuple[int, int], pos2: Tuple[int, int], player: str, move_num: int):
         """
         Initialize a quantum move.
@@ -32,13 +66,33 @@ class QuantumMove:
         self.move_num = move_num
         self.collapsed = False
         self.collapsed_position = None
+        # Formatted __str__, cleared when the move collapses
+        self._str_cache: Optional[str] = None
     
     def __str__(self) -> str:
         """String representation of the quantum move."""
-        if self.collapsed:
-            return f"{self.player}{self.move_num}@{self.collapsed_position}"
-        else:
-            return f"{self.player}{self.move_num}@({self.positions[0]},{self.positions[1]})"
+        if self._str_cache is None:
+            if self.collapsed:
+                self._str_cache = f"{self.player}{self.move_num}@{self.collapsed_position}"
+            else:
+                self._str_cache = f"{self.player}{self.move_num}@({self.positions[0]},{self.positions[1]})"
+        return self._str_cache
+    
+    def copy(self) -> 'QuantumMove':
+        """
+        Copy the move without going through __init__.
+        
+        Returns:
+            A new move with the same positions, player, number and collapse state
+        """
+        move = QuantumMove.__new__(QuantumMove)
+        move.positions = list(self.positions)
+        move.player = self.player
+        move.move_num = self.move_num
+        move.collapsed = self.collapsed
+        move.collapsed_position = self.collapsed_position
+        move._str_cache = self._str_cache
+        return move
     
     def collapse_to(self, position: Tuple[int, int]):
         """
@@ -52,6 +106,7 @@ class QuantumMove:
         
         self.collapsed = True
         self.collapsed_position = position
+        self._str_cache = None
     
     def get_positions(self) -> List[Tuple[int, int]]:
         """Get the positions in the superposition (or the collapsed position if collapsed)."""
@@ -90,6 +145,77 @@ class QuantumBoard:
         self.current_player = 'X'  # X goes first
         self.game_over = False
         self.winner = None
+        # Bumped on every mutation so derived views can be cached per board version
+        self._version = 0
+        # Bit row * size + col is set once a move has collapsed onto that cell
+        self._collapsed_mask = 0
+        # Collapsed moves packed 2 bits per cell (01 = X, 10 = O), see _packed_line_masks()
+        self._packed = 0
+        # Classical board of collapsed moves, kept in step with the two masks above
+        self._classical_board: List[List[Optional[str]]] = [[None] * size for _ in range(size)]
+        # Moves split by collapse state, in move order
+        self._uncollapsed: List[QuantumMove] = []
+        self._collapsed: List[QuantumMove] = []
+        # (version, position -> moves) index shared by the position queries, built lazily
+        self._position_index_cache: Optional[Tuple[int, Dict[Tuple[int, int], List[QuantumMove]]]] = None
+    
+    def clone(self) -> 'QuantumBoard':
+        """
+        Copy the board so it can be played forward independently, e.g. for AI lookahead.
+        
+        Moves are copied with QuantumMove.copy() rather than deepcopy, and the
+        derived collapse state is rebuilt in one pass over the copies.
+        
+        Returns:
+            A new board in the same state
+        """
+        board = QuantumBoard(size=self.size)
+        board.moves = [move.copy() for move in self.moves]
+        board.move_count = self.move_count
+        board.current_player = self.current_player
+        board.game_over = self.game_over
+        board.winner = self.winner
+        board._version = self._version
+        board._refresh_collapse_state()
+        return board
+    
+    def __reduce__(self):
+        """Pickle the board as its moves and game state; derived state is rebuilt on load."""
+        moves = tuple((move.player, move.positions[0], move.positions[1], move.collapsed_position)
+                      for move in self.moves)
+        return (QuantumBoard._from_state,
+                (self.size, moves, self.current_player, self.game_over, self.winner, self._version))
+    
+    @classmethod
+    def _from_state(cls, size: int, moves: Tuple[Tuple[str, Tuple[int, int], Tuple[int, int], Optional[Tuple[int, int]]], ...],
+                    current_player: str, game_over: bool, winner: Optional[str], version: int) -> 'QuantumBoard':
+        """
+        Rebuild a board from the state written by __reduce__.
+        
+        Args:
+            size: Size of the board
+            moves: (player, pos1, pos2, collapsed position or None) per move, in move order
+            current_player: Player to move
+            game_over: Whether the game is over
+            winner: Winner ('X' or 'O') or None
+            version: Board version counter
+            
+        Returns:
+            The rebuilt board
+        """
+        board = cls(size=size)
+        for move_num, (player, pos1, pos2, collapsed_position) in enumerate(moves, start=1):
+            move = QuantumMove(pos1, pos2, player, move_num)
+            if collapsed_position is not None:
+                move.collapse_to(collapsed_position)
+            board.moves.append(move)
+        board.move_count = len(moves)
+        board.current_player = current_player
+        board.game_over = game_over
+        board.winner = winner
+        board._version = version
+        board._refresh_collapse_state()
+        return board
     
     def make_move(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> List[QuantumMove]:
         """
@@ -109,13 +235,17 @@ class QuantumBoard:
                 raise ValueError(f"Position {pos} is outside the board")
         
         # Create the new move
+        self._version += 1
         self.move_count += 1
         new_move = QuantumMove(pos1, pos2, self.current_player, self.move_count)
         self.moves.append(new_move)
+        self._uncollapsed.append(new_move)
         
         # Check for collapses due to interference
         collapsed_moves = self._check_for_collapses()
         
+        self._refresh_collapse_state()
+        
         # Switch player
         self.current_player = 'O' if self.current_player == 'X' else 'X'
         
@@ -128,30 +258,54 @@ class QuantumBoard:
         """
         Check if any moves need to collapse due to interference.
         
+        Resolving a site can leave new interference behind, so every resolution is
+        followed by a fresh scan whose sites are handled before the rest of the
+        current scan. This runs as an explicit stack of scans rather than recursion.
+        
         Returns:
-            List of moves that collapsed
+            List of moves that collapsed at the sites of the first scan
         """
         # Keep track of which moves collapsed
         collapsed_moves = []
         
-        # Build a map of positions to uncollapsed moves
-        position_to_moves: Dict[Tuple[int, int], List[QuantumMove]] = {}
-        for move in self.moves:
-            if not move.collapsed:
-                for pos in move.positions:
-                    if pos not in position_to_moves:
-                        position_to_moves[pos] = []
-                    position_to_moves[pos].append(move)
-        
-        # Check for positions with multiple moves (interference)
-        for pos, moves in position_to_moves.items():
-            if len(moves) > 1:
-                # There's interference at this position
-                self._resolve_interference(pos, moves)
+        pending = [iter(self._interference_sites())]
+        while pending:
+            site = next(pending[-1], None)
+            if site is None:
+                pending.pop()
+                continue
+            
+            position, moves = site
+            self._resolve_interference(position, moves)
+            if len(pending) == 1:
                 collapsed_moves.extend(moves)
+            pending.append(iter(self._interference_sites()))
         
         return collapsed_moves
     
+    def _interference_sites(self) -> List[Tuple[Tuple[int, int], List[QuantumMove]]]:
+        """
+        Find the positions shared by more than one uncollapsed move.
+        
+        Returns:
+            List of (position, moves) pairs, in the order the positions are first touched
+        """
+        # Bucket uncollapsed moves by cell index (row * size + col), remembering the
+        # order in which cells were first touched
+        size = self.size
+        buckets: List[List[QuantumMove]] = [[] for _ in range(size * size)]
+        touched: List[int] = []
+        # Moves collapsed earlier in this cascade are still listed until the state is refreshed
+        for move in self._uncollapsed:
+            if not move.collapsed:
+                for row, col in move.positions:
+                    bucket = buckets[row * size + col]
+                    if not bucket:
+                        touched.append(row * size + col)
+                    bucket.append(move)
+        
+        return [(divmod(index, size), buckets[index]) for index in touched if len(buckets[index]) > 1]
+    
     def _resolve_interference(self, position: Tuple[int, int], moves: List[QuantumMove]):
         """
         Resolve interference between quantum moves at a position.
@@ -163,24 +317,23 @@ class QuantumBoard:
             position: Position where interference occurs
             moves: List of moves that are interfering
         """
+        # One random bit per move, drawn in a single call
+        coin_flips = random.getrandbits(len(moves))
+        
         # For each move, decide whether it collapses to this position or its alternative
         for move in moves:
-            # If the move has only this position in its superposition, it must collapse here
-            if len(move.get_positions()) == 1:
+            coin_flip = coin_flips & 1
+            coin_flips >>= 1
+            
+            # If the move has only this position in its superposition (it already collapsed), it must collapse here
+            if move.collapsed:
                 move.collapse_to(position)
                 continue
             
             # Otherwise, randomly decide where it collapses
-            # 50% chance to collapse to this position, 50% to the other position
-            if random.random() < 0.5:
-                move.collapse_to(position)
-            else:
-                # Collapse to the other position in the superposition
-                other_pos = move.positions[0] if move.positions[1] == position else move.positions[1]
-                move.collapse_to(other_pos)
-        
-        # After resolving interference, check if new interferences were created
-        self._check_for_collapses()
+            # 50% chance to collapse to this position, 50% to the other position in the superposition
+            first, second = move.positions
+            move.collapse_to(position if coin_flip else (first if second == position else second))
     
     def force_collapse(self, move_index: int, position: Tuple[int, int]) -> List[QuantumMove]:
         """
@@ -204,66 +357,92 @@ class QuantumBoard:
             raise ValueError(f"Position {position} is not in the superposition of move {move_index}")
         
         # Collapse the move
+        self._version += 1
         move.collapse_to(position)
         
         # Check for cascading collapses
         collapsed_moves = self._check_for_collapses()
         collapsed_moves.append(move)
+        self._refresh_collapse_state()
         
         # Check if the game is over
         self._check_game_state()
         
         return collapsed_moves
     
+    def _refresh_collapse_state(self):
+        """Rebuild the move lists, collapsed-cell bitmask, packed board and classical board after moves have collapsed."""
+        mask = 0
+        packed = 0
+        board = [[None] * self.size for _ in range(self.size)]
+        uncollapsed = []
+        collapsed = []
+        for move in self.moves:
+            if not move.collapsed:
+                uncollapsed.append(move)
+            else:
+                collapsed.append(move)
+                row, col = move.collapsed_position
+                bit = row * self.size + col
+                mask |= 1 << bit
+                # Later moves overwrite the cell
+                packed = packed & ~(0b11 << (2 * bit)) | (0b01 if move.player == 'X' else 0b10) << (2 * bit)
+                board[row][col] = move.player
+        self._collapsed_mask = mask
+        self._packed = packed
+        self._classical_board = board
+        self._uncollapsed = uncollapsed
+        self._collapsed = collapsed
+    
+    def is_collapsed(self, position: Tuple[int, int]) -> bool:
+        """
+        Check if a position holds a collapsed move.
+        
+        Args:
+            position: Position to check
+            
+        Returns:
+            True if a move has collapsed onto the position, False otherwise
+        """
+        row, col = position
+        return bool(self._collapsed_mask >> (row * self.size + col) & 1)
+    
     def _check_game_state(self):
         """Check if the game is over (win or draw)."""
-        # Get the classical board state (only considering collapsed moves)
-        board = self.get_classical_board()
-        
         # Check for a win
-        winner = self._check_winner(board)
+        winner = self._check_winner()
         if winner:
             self.game_over = True
             self.winner = winner
             return
         
         # Check for a draw (all cells filled with collapsed moves)
-        if all(cell is not None for row in board for cell in row):
+        if self._collapsed_mask == (1 << (self.size * self.size)) - 1:
             self.game_over = True
             self.winner = None  # Draw
             return
         
         # Check if all moves are collapsed and there's no winner
-        if all(move.collapsed for move in self.moves) and not self.winner:
+        if not self._uncollapsed and not self.winner:
             self.game_over = True
             self.winner = None  # Draw
     
-    def _check_winner(self, board: List[List[Optional[str]]]) -> Optional[str]:
+    def _check_winner(self) -> Optional[str]:
         """
-        Check if there's a winner on the board.
+        Check if there's a winner on the packed classical board.
         
-        Args:
-            board: Classical board state
-            
         Returns:
             Winner ('X' or 'O') or None if no winner
         """
-        # Check rows
-        for row in board:
-            if row[0] is not None and all(cell == row[0] for cell in row):
-                return row[0]
-        
-        # Check columns
-        for col in range(self.size):
-            if board[0][col] is not None and all(board[row][col] == board[0][col] for row in range(self.size)):
-                return board[0][col]
+        packed = self._packed
         
-        # Check diagonals
-        if board[0][0] is not None and all(board[i][i] == board[0][0] for i in range(self.size)):
-            return board[0][0]
-        
-        if board[0][self.size-1] is not None and all(board[i][self.size-1-i] == board[0][self.size-1] for i in range(self.size)):
-            return board[0][self.size-1]
+        # Rows, then columns, then diagonals; a line is won when every cell holds the same mark
+        for x_line in _packed_line_masks(self.size):
+            if packed & x_line == x_line:
+                return 'X'
+            o_line = x_line << 1
+            if packed & o_line == o_line:
+                return 'O'
         
         return None
     
@@ -274,16 +453,37 @@ class QuantumBoard:
         Returns:
             2D list representing the board, with each cell containing 'X', 'O', or None
         """
-        # Initialize empty board
-        board = [[None for _ in range(self.size)] for _ in range(self.size)]
+        # Copy the maintained board so callers can't modify it
+        return [row[:] for row in self._classical_board]
+    
+    def get_classical_bytes(self) -> bytes:
+        """
+        Get the classical board state as a flat buffer, considering only collapsed moves.
         
-        # Fill in collapsed moves
-        for move in self.moves:
-            if move.collapsed:
-                row, col = move.collapsed_position
-                board[row][col] = move.player
+        Returns:
+            Bytes of length size * size indexed by row * size + col, each cell
+            holding CELL_EMPTY, CELL_X or CELL_O
+        """
+        codes = {None: CELL_EMPTY, 'X': CELL_X, 'O': CELL_O}
+        return bytes(codes[cell] for row in self._classical_board for cell in row)
+    
+    def _position_index(self) -> Dict[Tuple[int, int], List[QuantumMove]]:
+        """
+        Get the moves at each position, rebuilt only after the board changes.
         
-        return board
+        Returns:
+            Dictionary mapping positions to the moves there (collapsed moves at their
+            collapsed position, uncollapsed moves at both positions), in move order
+        """
+        if self._position_index_cache is None or self._position_index_cache[0] != self._version:
+            index: Dict[Tuple[int, int], List[QuantumMove]] = {}
+            for move in self.moves:
+                for pos in move.get_positions():
+                    if pos not in index:
+                        index[pos] = []
+                    index[pos].append(move)
+            self._position_index_cache = (self._version, index)
+        return self._position_index_cache[1]
     
     def get_quantum_board(self) -> Dict[Tuple[int, int], List[QuantumMove]]:
         """
@@ -292,18 +492,7 @@ class QuantumBoard:
         Returns:
             Dictionary mapping positions to lists of quantum moves at those positions
         """
-        # Initialize empty board
-        quantum_board: Dict[Tuple[int, int], List[QuantumMove]] = {}
-        
-        # Add all moves (collapsed and uncollapsed)
-        for move in self.moves:
-            positions = move.get_positions()
-            for pos in positions:
-                if pos not in quantum_board:
-                    quantum_board[pos] = []
-                quantum_board[pos].append(move)
-        
-        return quantum_board
+        return {pos: list(moves) for pos, moves in self._position_index().items()}
     
     def get_move_at(self, position: Tuple[int, int]) -> List[QuantumMove]:
         """
@@ -315,14 +504,7 @@ class QuantumBoard:
         Returns:
             List of moves at the position
         """
-        moves_at_position = []
-        for move in self.moves:
-            if move.collapsed and move.collapsed_position == position:
-                moves_at_position.append(move)
-            elif not move.collapsed and position in move.positions:
-                moves_at_position.append(move)
-        
-        return moves_at_position
+        return list(self._position_index().get(position, ()))
     
     def is_valid_move(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> bool:
         """
@@ -341,22 +523,35 @@ class QuantumBoard:
             True if the move is valid, False otherwise
         """
         # Check if positions are on the board
-        for pos in [pos1, pos2]:
-            row, col = pos
-            if not (0 <= row < self.size and 0 <= col < self.size):
-                return False
+        size = self.size
+        (row1, col1), (row2, col2) = pos1, pos2
+        if not (0 <= row1 < size and 0 <= col1 < size and 0 <= row2 < size and 0 <= col2 < size):
+            return False
         
         # Check if positions are different
         if pos1 == pos2:
             return False
         
         # Check if either position has a collapsed move
-        for pos in [pos1, pos2]:
-            for move in self.moves:
-                if move.is_collapsed_at(pos):
-                    return False
+        return not self._collapsed_mask & ((1 << (row1 * size + col1)) | (1 << (row2 * size + col2)))
+    
+    def iter_valid_moves(self) -> Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """
+        Iterate over all valid quantum moves without building a list.
+        
+        A quantum move is an unordered pair, so each pair appears once,
+        with pos1 before pos2 in row-major order.
+        
+        Returns:
+            Iterator of valid moves, each represented as a pair of positions
+        """
+        # Open cells in row-major order, read off the collapsed-cell mask by cell index
+        collapsed_mask = self._collapsed_mask
+        open_cells = [divmod(index, self.size) for index in range(self.size * self.size)
+                      if not collapsed_mask >> index & 1]
         
-        return True
+        # Generate every unordered pair of open cells once
+        return combinations(open_cells, 2)
     
     def get_valid_moves(self) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
         """
@@ -365,30 +560,31 @@ class QuantumBoard:
         Returns:
             List of valid moves, each represented as a pair of positions
         """
-        valid_moves = []
+        return list(self.iter_valid_moves())
+    
+    def get_entanglement_matrix(self) -> np.ndarray:
+        """
+        Get the entanglement graph of the board as an adjacency matrix.
         
-        # Get positions that already have collapsed moves
-        occupied_positions = set()
-        for move in self.moves:
-            if move.collapsed:
-                occupied_positions.add(move.collapsed_position)
-        
-        # Generate all possible pairs of positions
-        for row1 in range(self.size):
-            for col1 in range(self.size):
-                pos1 = (row1, col1)
-                if pos1 in occupied_positions:
-                    continue
-                
-                for row2 in range(self.size):
-                    for col2 in range(self.size):
-                        pos2 = (row2, col2)
-                        if pos2 in occupied_positions or pos1 == pos2:
-                            continue
-                        
-                        valid_moves.append((pos1, pos2))
-        
-        return valid_moves
+        Returns:
+            Symmetric boolean array of shape (size * size, size * size), where
+            entry [i, j] is True if cells i and j (index row * size + col) are
+            entangled through an uncollapsed move
+        """
+        size = self.size
+        n = size * size
+        adjacency = np.zeros((n, n), dtype=bool)
+        
+        # One edge per uncollapsed move, set with a single fancy-indexed write
+        edges = [((row1 * size + col1), (row2 * size + col2))
+                 for move in self._uncollapsed if len(move.positions) > 1
+                 for (row1, col1), (row2, col2) in [move.positions]]
+        if edges:
+            edge_index = np.array(edges)
+            adjacency[edge_index[:, 0], edge_index[:, 1]] = True
+            adjacency |= adjacency.T
+        
+        return adjacency
     
     def get_entanglement_graph(self) -> Dict[Tuple[int, int], Set[Tuple[int, int]]]:
         """
@@ -400,19 +596,14 @@ class QuantumBoard:
         Returns:
             Dictionary mapping positions to sets of entangled positions
         """
-        entanglement_graph: Dict[Tuple[int, int], Set[Tuple[int, int]]] = {}
-        
-        # Initialize the graph with all positions
-        for row in range(self.size):
-            for col in range(self.size):
-                entanglement_graph[(row, col)] = set()
+        size = self.size
+        entanglement_graph: Dict[Tuple[int, int], Set[Tuple[int, int]]] = {
+            (row, col): set() for row in range(size) for col in range(size)
+        }
         
-        # Add entanglement edges from uncollapsed moves
-        for move in self.moves:
-            if not move.collapsed and len(move.positions) > 1:
-                pos1, pos2 = move.positions
-                entanglement_graph[pos1].add(pos2)
-                entanglement_graph[pos2].add(pos1)
+        # Expand the adjacency matrix into position sets
+        for i, j in np.argwhere(self.get_entanglement_matrix()).tolist():
+            entanglement_graph[divmod(i, size)].add(divmod(j, size))
         
         return entanglement_graph
     
@@ -437,7 +628,17 @@ class QuantumBoard:
         Returns:
             List of uncollapsed moves
         """
-        return [move for move in self.moves if not move.collapsed]
+        return list(self._uncollapsed)
+    
+    def get_uncollapsed_moves_with_index(self) -> List[Tuple[int, QuantumMove]]:
+        """
+        Get all uncollapsed moves together with their index in the move list.
+        
+        Returns:
+            List of (move_index, move) tuples for the uncollapsed moves
+        """
+        # Moves are numbered from 1 in the order they were appended to self.moves
+        return [(move.move_num - 1, move) for move in self._uncollapsed]
     
     def get_collapsed_moves(self) -> List[QuantumMove]:
         """
@@ -446,7 +647,7 @@ class QuantumBoard:
         Returns:
             List of collapsed moves
         """
-        return [move for move in self.moves if move.collapsed]
+        return list(self._collapsed)
     
     def get_superposition_count(self, position: Tuple[int, int]) -> int:
         """
@@ -458,8 +659,4 @@ class QuantumBoard:
         Returns:
             Number of uncollapsed moves at the position
         """
-        count = 0
-        for move in self.moves:
-            if not move.collapsed and position in move.positions:
-                count += 1
-        return count
\ No newline at end of file
+        return sum(1 for move in self._position_index().get(position, ()) if not move.collapsed)